@@ -1,28 +1,19 @@
-import sys
-import os
-import importlib.util
-
-# Get the absolute path to the Flask app and its directory
-app_path = os.path.join(os.path.dirname(__file__), 'skill-bridge', 'main.py')
-app_dir = os.path.dirname(app_path)
+"""Run Skill Bridge from this directory: python main.py
 
-# Create instance directory if it doesn't exist
-instance_dir = os.path.join(os.path.dirname(__file__), 'instance')
-if not os.path.exists(instance_dir):
-    os.makedirs(instance_dir)
-
-# Set the working directory to the app directory for proper imports and file paths
-os.chdir(app_dir)
+The application itself is skill-bridge/main.py. Production servers should load
+its factory directly, e.g. gunicorn --chdir skill-bridge -w 4 'main:create_app()'.
+"""
+import os
+import sys
 
-# Import the app from the module
-spec = importlib.util.spec_from_file_location("flask_app", app_path)
-flask_app = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(flask_app)
+# Put the application directory first, so that `main` below is the app module and not this file
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill-bridge'))
 
-# Get the app object
-app = flask_app.app
+from main import create_app, init_db
 
 if __name__ == '__main__':
-    # Ensure the instance path is accessible to the app
-    app.instance_path = instance_dir
-    app.run(debug=True, port=5001) 
\ No newline at end of file
+    app = create_app()
+    with app.app_context():
+        # Initialize the database but preserve existing users
+        init_db()
+    app.run(debug=True, port=5001)
@@ -0,0 +1,118 @@
+"""Prefix trie for autocompleting skills and tags, ranked by how often each is used.
+
+Names are indexed by their lower-cased text and from the start of every later
+word, so 'des' finds 'ui design' too. Every trie node keeps its best few
+completions, so a lookup walks the prefix and reads one short list however
+many names are indexed, and a count change only refreshes the nodes on that
+name's paths.
+"""
+import heapq
+import threading
+
+def normalize(text):
+    """Lower-case text with runs of whitespace collapsed, as names are indexed and looked up."""
+    return ' '.join(text.lower().split())
+
+class Node:
+    __slots__ = ('children', 'terminals', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.terminals = set()
+        self.top = []
+
+class PrefixIndex:
+    """Completions for one kind of name (skills or tags), best first by count."""
+
+    def __init__(self, keep=10):
+        self.keep = keep
+        self.root = Node()
+        self.counts = {}
+        self.display = {}
+        self.loaded_at = None
+        self.version = None
+        self.lock = threading.Lock()
+
+    def load(self, items, loaded_at=None, version=None):
+        """Rebuild from (name, count) pairs; names that normalize alike are merged under the most used spelling."""
+        counts, display, best = {}, {}, {}
+        for name, count in items:
+            key = normalize(name)
+            if not key:
+                continue
+            counts[key] = counts.get(key, 0) + count
+            if count > best.get(key, -1):
+                display[key], best[key] = name.strip(), count
+        root = Node()
+        for key in counts:
+            self._insert(root, key)
+        self._refresh_subtree(root, counts)
+        with self.lock:
+            self.root, self.counts, self.display = root, counts, display
+            self.loaded_at, self.version = loaded_at, version
+
+    def update(self, name, delta):
+        """Add delta to a name's count, indexing it if it is new and dropping it when it reaches zero."""
+        key = normalize(name)
+        if not key or not delta:
+            return
+        with self.lock:
+            count = self.counts.get(key, 0) + delta
+            if count > 0:
+                if key not in self.counts:
+                    self._insert(self.root, key)
+                    self.display[key] = name.strip()
+                self.counts[key] = count
+            else:
+                self.counts.pop(key, None)
+                self.display.pop(key, None)
+            # Deepest first, so that each node is refreshed from already updated children
+            for _, node in sorted(self._path_nodes(key), key=lambda item: -item[0]):
+                self._refresh(node, self.counts)
+
+    def complete(self, prefix, limit=10):
+        """Up to limit (name, count) pairs starting with prefix, or with a later word starting with it."""
+        with self.lock:
+            node = self.root
+            for char in normalize(prefix):
+                node = node.children.get(char)
+                if node is None:
+                    return []
+            return [(self.display[key], self.counts[key]) for key in node.top[:limit]]
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _starts(self, key):
+        """Where the full name and each of its later words begin."""
+        return [0] + [position + 1 for position, char in enumerate(key) if char == ' ']
+
+    def _insert(self, root, key):
+        for start in self._starts(key):
+            node = root
+            for char in key[start:]:
+                node = node.children.setdefault(char, Node())
+            node.terminals.add(key)
+
+    def _path_nodes(self, key):
+        """(depth, node) for the root and every node on the paths of key, each once."""
+        nodes = {id(self.root): (0, self.root)}
+        for start in self._starts(key):
+            node = self.root
+            for depth, char in enumerate(key[start:], 1):
+                node = node.children.get(char)
+                if node is None:
+                    break
+                nodes[id(node)] = (depth, node)
+        return list(nodes.values())
+
+    def _refresh(self, node, counts):
+        candidates = {key for key in node.terminals if key in counts}
+        for child in node.children.values():
+            candidates.update(key for key in child.top if key in counts)
+        node.top = heapq.nsmallest(self.keep, candidates, key=lambda key: (-counts[key], key))
+
+    def _refresh_subtree(self, node, counts):
+        for child in node.children.values():
+            self._refresh_subtree(child, counts)
+        self._refresh(node, counts)
@@ -0,0 +1,77 @@
+"""Benchmark MinHash LSH "people like you" lookups against an exact Jaccard scan.
+
+For each band/row setting it reports recall@k (the share of the exact k most
+similar users that LSH also returns, counting ties as found), how many
+candidates were scored per lookup, and the lookup and build times.
+
+Usage: python bench_lsh.py [--sizes 10000 100000] [--queries 200] [--k 10] [--settings 32x2 16x4]
+"""
+import argparse
+import heapq
+import random
+import time
+
+from lsh import MinHashLSH, jaccard, tokens
+from synthetic import TAGS, make_vocabulary, random_skills, skill_weights
+
+def exact(users, query_id, token_set, k):
+    scored = [(jaccard(token_set, other), -user_id) for user_id, other in users.items() if user_id != query_id]
+    return [(-negative_id, similarity) for similarity, negative_id in heapq.nlargest(k, scored) if similarity > 0]
+
+def run(size, settings, queries, k, rng, vocabulary, weights):
+    users = {user_id: tokens(random_skills(rng, vocabulary, weights), ', '.join(rng.sample(TAGS, 2)))
+             for user_id in range(1, size + 1)}
+    sample = rng.sample(sorted(users), min(queries, size))
+
+    start = time.perf_counter()
+    expected = {user_id: exact(users, user_id, users[user_id], k) for user_id in sample}
+    scan = (time.perf_counter() - start) / len(sample)
+    print(f'{size:>8} users | exact scan {scan * 1000:8.2f} ms/query')
+
+    for bands, rows in settings:
+        index = MinHashLSH(bands, rows)
+        start = time.perf_counter()
+        index.load(users.items())
+        build = time.perf_counter() - start
+
+        found = wanted = scored = 0
+        start = time.perf_counter()
+        results = {user_id: index.query(users[user_id], k, exclude=user_id) for user_id in sample}
+        lookup = (time.perf_counter() - start) / len(sample)
+        for user_id in sample:
+            scored += len(index.candidates(users[user_id]))
+            want = expected[user_id]
+            if not want:
+                continue
+            # Any user as similar as the k-th exact neighbour is an equally good answer
+            floor = want[-1][1]
+            wanted += len(want)
+            found += sum(1 for _, similarity in results[user_id] if similarity >= floor)
+        recall = found / wanted if wanted else 1.0
+        print(f'         {bands:>3} bands x {rows} rows | recall@{k} {recall:6.3f} | '
+              f'{scored / len(sample):8.0f} candidates/query | lookup {lookup * 1000:7.2f} ms/query | '
+              f'speedup {scan / lookup:6.1f}x | build {build:6.2f} s')
+
+def setting(value):
+    bands, rows = value.lower().split('x')
+    return int(bands), int(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--settings', type=setting, nargs='+', default=[(64, 1), (32, 2), (20, 3), (16, 4)],
+                        help='BANDSxROWS pairs')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--vocabulary', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary)
+    weights = skill_weights(vocabulary)
+    for size in args.sizes:
+        run(size, args.settings, args.queries, args.k, rng, vocabulary, weights)
+
+if __name__ == '__main__':
+    main()
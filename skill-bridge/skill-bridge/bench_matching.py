@@ -0,0 +1,53 @@
+"""Benchmark calculate_skill_match against SkillMatchEngine.
+
+Usage: python bench_matching.py [--sizes 10000 100000] [--users 20] [--seed 42]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from matching import SkillMatchEngine, calculate_skill_match, parse_skills
+from synthetic import make_vocabulary, random_skills, skill_weights
+
+def run(size, users, rng, vocabulary, weights):
+    projects = [(project_id, random_skills(rng, vocabulary, weights)) for project_id in range(1, size + 1)]
+    user_skills = [random_skills(rng, vocabulary, weights) for _ in range(users)]
+
+    engine = SkillMatchEngine()
+    start = time.perf_counter()
+    engine.load((project_id, parse_skills(skills)) for project_id, skills in projects)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [[calculate_skill_match(skills, required) for _, required in projects] for skills in user_skills]
+    loop = (time.perf_counter() - start) / users
+
+    start = time.perf_counter()
+    actual = [engine.scores(skills) for skills in user_skills]
+    vectorized = (time.perf_counter() - start) / users
+
+    for want, got in zip(expected, actual):
+        assert np.array_equal(np.asarray(want), got), 'engine scores differ from calculate_skill_match'
+
+    print(f'{size:>8} projects | build {build * 1000:8.1f} ms | '
+          f'calculate_skill_match {loop * 1000:8.2f} ms/user | '
+          f'engine {vectorized * 1000:6.2f} ms/user | speedup {loop / vectorized:6.1f}x')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--vocabulary', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary)
+    weights = skill_weights(vocabulary)
+    for size in args.sizes:
+        run(size, args.users, rng, vocabulary, weights)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Benchmark the hot routes and calculate_skill_match on synthetic data at several scales.
+
+Each scale gets a fresh SQLite database with that many users and projects,
+--messages messages and --reviews reviews per user. Every route is requested
+through the Flask test client as a logged-in synthetic user, and the timings
+and SQL query counts are written to a JSON file, so runs can be compared.
+
+Usage: python bench_routes.py [--scales 1000 10000] [--repeat 20] [--seed 42] [--output bench_results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from main import create_app, db, get_project_snapshot, load_synthetic_data, upgrade_database, setup_search_index, Project
+from matching import calculate_skill_match
+
+ROUTES = [
+    ('index', '/'),
+    ('index_match', '/?sort=match'),
+    ('search', '/search?q=python'),
+    ('search_projects', '/search?q=data+analysis&type=projects'),
+    ('recommendations', '/recommendations'),
+    ('api_recommendations', '/api/v1/recommendations'),
+    ('api_search', '/api/v1/search?q=design'),
+    ('profile', '/profile/{username}'),
+    ('project_detail', '/project/{project_id}'),
+    ('messages', '/messages')
+]
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        'min_ms': round(samples[0], 3),
+        'max_ms': round(samples[-1], 3)
+    }
+
+def bench_routes(app, client, user, project_id, repeat):
+    queries = [0]
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: queries.__setitem__(0, queries[0] + 1))
+    results = {}
+    for name, url in ROUTES:
+        url = url.format(username=user['username'], project_id=project_id)
+        # The first request warms the recommendation cache and the match engine
+        status = client.get(url).status_code
+        samples = []
+        queries[0] = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            client.get(url)
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = dict(url=url, status=status, queries=queries[0] / repeat, **summarize(samples))
+        print(f"  {name:<20} {results[name]['median_ms']:9.2f} ms median {results[name]['p95_ms']:9.2f} ms p95 "
+              f"{results[name]['queries']:6.1f} queries")
+    return results
+
+def bench_matching(app, user, repeat):
+    """Score the user against every project with calculate_skill_match and with the bitmask engine."""
+    with app.app_context():
+        projects = [skills for (skills,) in db.session.query(Project.required_skills)]
+        engine = get_project_snapshot().engine
+        loop, vectorized = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for required in projects:
+                calculate_skill_match(user['skills'], required)
+            loop.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            engine.scores(user['skills'])
+            vectorized.append((time.perf_counter() - start) * 1000)
+    results = {'calculate_skill_match': summarize(loop), 'match_engine': summarize(vectorized)}
+    print(f"  {'calculate_skill_match':<20} {results['calculate_skill_match']['median_ms']:9.2f} ms median "
+          f"(engine {results['match_engine']['median_ms']:.2f} ms)")
+    return results
+
+def run(scale, args):
+    scratch = tempfile.mkdtemp(prefix='skillbridge-bench-')
+    try:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(scratch, 'bench.db')}",
+            'WTF_CSRF_ENABLED': False,
+            'PAGE_CACHE_ENABLED': False
+        })
+        app.logger.disabled = True
+        with app.app_context():
+            upgrade_database()
+            setup_search_index()
+            start = time.perf_counter()
+            data = load_synthetic_data(scale, scale, scale * args.messages, scale * args.reviews, seed=args.seed)
+            load_seconds = time.perf_counter() - start
+        print(f'{scale} users and projects loaded in {load_seconds:.1f} s')
+
+        user = data['users'][0]
+        client = app.test_client()
+        client.post('/login', data={'email': user['email'], 'password': 'password123'})
+        return {
+            'users': len(data['users']),
+            'projects': len(data['projects']),
+            'messages': len(data['messages']),
+            'reviews': len(data['reviews']),
+            'load_seconds': round(load_seconds, 3),
+            'routes': bench_routes(app, client, user, data['projects'][0]['id'], args.repeat),
+            'matching': bench_matching(app, user, args.repeat)
+        }
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--messages', type=int, default=5, help='Messages per user.')
+    parser.add_argument('--reviews', type=int, default=1, help='Reviews per user.')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_results.json')
+    args = parser.parse_args()
+
+    results = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'scales': [run(scale, args) for scale in args.scales]
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import json
+import queue
+import threading
+
+class EventHub:
+    """In-process publish/subscribe hub for pushing events to connected users.
+
+    Every open event stream holds a bounded queue; publishing to a user puts
+    the event on each of that user's queues. Subscribers that fall too far
+    behind lose events rather than blocking the publisher. The hub lives in
+    one process, so every worker only reaches the streams it is serving.
+    """
+
+    def __init__(self, max_queued=100):
+        self.max_queued = max_queued
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        """Open a queue that receives every event published to user_id."""
+        events = queue.Queue(maxsize=self.max_queued)
+        with self.lock:
+            self.subscribers.setdefault(user_id, set()).add(events)
+        return events
+
+    def unsubscribe(self, user_id, events):
+        with self.lock:
+            queues = self.subscribers.get(user_id, set())
+            queues.discard(events)
+            if not queues:
+                self.subscribers.pop(user_id, None)
+
+    def publish(self, user_id, event, data):
+        """Send an event to all of the user's open streams; returns how many received it."""
+        with self.lock:
+            queues = list(self.subscribers.get(user_id, ()))
+        delivered = 0
+        for events in queues:
+            try:
+                events.put_nowait((event, data))
+                delivered += 1
+            except queue.Full:
+                pass
+        return delivered
+
+    def stream(self, events, keepalive=15):
+        """Yield server-sent event frames from a subscribed queue, with comment keepalives."""
+        yield 'retry: 5000\n\n'
+        while True:
+            try:
+                event, data = events.get(timeout=keepalive)
+            except queue.Empty:
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(event, data)
+
+def format_event(event, data):
+    """Encode one event as a text/event-stream frame."""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
@@ -0,0 +1,165 @@
+"""Streaming readers and row validation for bulk imports.
+
+Rows come from CSV files with a header line or from JSON Lines files, one
+object per line, and are read one at a time, so a file of any size imports in
+constant memory. Each validate_* function returns the cleaned column values of
+one row or raises RowError with the reason the row was rejected.
+"""
+import csv
+import json
+from datetime import date
+from itertools import islice
+
+from email_validator import EmailNotValidError, validate_email
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+PROJECT_STATUSES = ('active', 'completed', 'cancelled')
+ACADEMIC_PROJECT_TYPES = ('comps', 'gateway')
+
+class RowError(ValueError):
+    """A row that cannot be imported; the message says why."""
+
+def detect_format(path):
+    """'csv' or 'jsonl', from the file extension."""
+    for extension, format in FORMATS.items():
+        if path.lower().endswith(extension):
+            return format
+    raise ValueError(f'Cannot tell the format of {path}; use .csv, .jsonl or .ndjson')
+
+def read_rows(f, format):
+    """Yield (line number, row) for each record of an open text file.
+
+    A JSON line that does not parse is yielded as a RowError instead of a row.
+    """
+    if format == 'csv':
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as error:
+            yield number, RowError(f'invalid JSON: {error.msg}')
+
+def batched(iterable, size):
+    """Lists of up to size items, consumed lazily from iterable."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def text(row, key, required=False, max_length=None, default=''):
+    value = row.get(key)
+    value = default if value is None else str(value).strip()
+    if required and not value:
+        raise RowError(f'{key} is required')
+    if max_length and len(value) > max_length:
+        raise RowError(f'{key} is longer than {max_length} characters')
+    return value
+
+def integer(row, key, default=None, low=1, high=100):
+    value = row.get(key)
+    if value is None or str(value).strip() == '':
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise RowError(f'{key} must be a whole number') from None
+    if not low <= value <= high:
+        raise RowError(f'{key} must be between {low} and {high}')
+    return value
+
+def skill_list(row, key, max_length=500):
+    """A skills column as a comma-separated list or a JSON array, cleaned of blanks and case-insensitive repeats."""
+    value = row.get(key) or ''
+    names = value if isinstance(value, list) else str(value).split(',')
+    seen = {}
+    for name in (str(name).strip() for name in names):
+        if name and name.lower() not in seen:
+            seen[name.lower()] = name
+    joined = ', '.join(seen.values())
+    if len(joined) > max_length:
+        raise RowError(f'{key} is longer than {max_length} characters')
+    return joined
+
+def check_row(row):
+    if isinstance(row, RowError):
+        raise row
+    if not isinstance(row, dict):
+        raise RowError('not an object')
+
+def validate_user(row):
+    """Columns: username, email, password; optional major, skills, interests, bio, github, linkedin, profile_image."""
+    check_row(row)
+    try:
+        email = validate_email(text(row, 'email', required=True, max_length=120), check_deliverability=False).normalized
+    except EmailNotValidError as error:
+        raise RowError(f'email is not valid: {error}') from None
+    username = text(row, 'username', required=True, max_length=80)
+    if len(username) < 2:
+        raise RowError('username must be at least 2 characters')
+    password = text(row, 'password', required=True)
+    if len(password) < 6:
+        raise RowError('password must be at least 6 characters')
+    return {
+        'username': username,
+        'email': email,
+        'password': password,
+        'major': text(row, 'major', max_length=100),
+        'skills': skill_list(row, 'skills'),
+        'interests': skill_list(row, 'interests'),
+        'bio': text(row, 'bio', max_length=500),
+        'github': text(row, 'github', max_length=200) or None,
+        'linkedin': text(row, 'linkedin', max_length=200) or None,
+        'profile_image': text(row, 'profile_image', max_length=200)
+    }
+
+def validate_project(row):
+    """Columns: title, description, creator (username or email); optional required_skills, tags, status, max_collaborators."""
+    check_row(row)
+    status = text(row, 'status', default='active').lower()
+    if status not in PROJECT_STATUSES:
+        raise RowError(f"status must be one of {', '.join(PROJECT_STATUSES)}")
+    return {
+        'title': text(row, 'title', required=True, max_length=100),
+        'description': text(row, 'description', required=True),
+        'required_skills': skill_list(row, 'required_skills'),
+        'tags': skill_list(row, 'tags', max_length=200),
+        'status': status,
+        'max_collaborators': integer(row, 'max_collaborators', default=5),
+        'creator': text(row, 'creator', required=True)
+    }
+
+def validate_academic_project(row):
+    """Columns: title, description, project_type, department, creator; optional advisor, deadline, requirements,
+    max_collaborators, tags, status."""
+    check_row(row)
+    project_type = text(row, 'project_type', required=True).lower()
+    if project_type not in ACADEMIC_PROJECT_TYPES:
+        raise RowError(f"project_type must be one of {', '.join(ACADEMIC_PROJECT_TYPES)}")
+    deadline = text(row, 'deadline')
+    try:
+        deadline = date.fromisoformat(deadline) if deadline else None
+    except ValueError:
+        raise RowError('deadline must be a YYYY-MM-DD date') from None
+    return {
+        'title': text(row, 'title', required=True, max_length=100),
+        'description': text(row, 'description', required=True),
+        'project_type': project_type,
+        'department': text(row, 'department', required=True, max_length=50),
+        'advisor': text(row, 'advisor', max_length=100),
+        'deadline': deadline,
+        'requirements': text(row, 'requirements'),
+        'max_collaborators': integer(row, 'max_collaborators'),
+        'tags': skill_list(row, 'tags', max_length=200),
+        'status': text(row, 'status', max_length=20, default='Open') or 'Open',
+        'creator': text(row, 'creator', required=True)
+    }
+
+VALIDATORS = {
+    'users': validate_user,
+    'projects': validate_project,
+    'academic-projects': validate_academic_project
+}
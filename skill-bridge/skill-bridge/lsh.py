@@ -0,0 +1,132 @@
+"""MinHash signatures and banded locality-sensitive hashing over users' skill and interest sets.
+
+Each user's set of tokens is summarized by bands * rows MinHash values; two
+users agree on any one value with probability equal to the Jaccard similarity
+of their sets. The signature is cut into bands of rows values each, and users
+whose signatures agree on a whole band land in the same bucket. A lookup
+only scores the users sharing a bucket with the query, so it touches a small
+fraction of everyone; more bands of fewer rows find more of the true
+neighbours but score more candidates (see bench_lsh.py).
+"""
+import heapq
+import threading
+import zlib
+from itertools import islice
+
+import numpy as np
+
+# Largest prime below 2**32, so hashed values fit in uint32
+PRIME = 4294967291
+
+def tokens(skills, interests):
+    """The token set of a user: canonical skills and interests, kept apart by a prefix."""
+    def terms(text):
+        return {term.strip().lower() for term in (text or '').split(',') if term.strip()}
+    return frozenset({'skill:' + term for term in terms(skills)} | {'interest:' + term for term in terms(interests)})
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+class MinHashLSH:
+    """Approximate Jaccard-nearest neighbours among indexed users."""
+
+    def __init__(self, bands=32, rows=2, seed=1):
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        # Hash functions (a * x + b) mod PRIME, with a * x + b small enough not to overflow uint64
+        self.a = rng.integers(1, 2 ** 31, bands * rows, dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 31, bands * rows, dtype=np.uint64)
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+        self.token_sets = {}
+        self.loaded_at = None
+        self.lock = threading.Lock()
+
+    def signature(self, token_set):
+        hashed = np.array([zlib.crc32(token.encode()) for token in token_set], dtype=np.uint64)
+        return ((np.outer(hashed, self.a) + self.b) % PRIME).min(axis=0).astype(np.uint32)
+
+    def band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, user_id, token_set):
+        """Index (or re-index) a user; a user with no tokens is only removed."""
+        signature = self.signature(token_set) if token_set else None
+        with self.lock:
+            self._remove(user_id)
+            if signature is None:
+                return
+            for bucket, key in zip(self.buckets, self.band_keys(signature)):
+                bucket.setdefault(key, set()).add(user_id)
+            self.signatures[user_id] = signature
+            self.token_sets[user_id] = token_set
+
+    def remove(self, user_id):
+        with self.lock:
+            self._remove(user_id)
+
+    def get(self, user_id):
+        """The indexed token set of a user, or None."""
+        with self.lock:
+            return self.token_sets.get(user_id)
+
+    def load(self, users, loaded_at=None, chunk_size=10000):
+        """Rebuild from (user_id, token set) pairs, hashing chunk_size users at a time."""
+        buckets = [{} for _ in range(self.bands)]
+        signatures, token_sets = {}, {}
+        users = iter(users)
+        while batch := list(islice(users, chunk_size)):
+            chunk = [(user_id, token_set) for user_id, token_set in batch if token_set]
+            if not chunk:
+                continue
+            for (user_id, token_set), signature in zip(chunk, self.signatures_of([token_set for _, token_set in chunk])):
+                for bucket, key in zip(buckets, self.band_keys(signature)):
+                    bucket.setdefault(key, set()).add(user_id)
+                signatures[user_id] = signature
+                token_sets[user_id] = token_set
+        with self.lock:
+            self.buckets, self.signatures, self.token_sets = buckets, signatures, token_sets
+            self.loaded_at = loaded_at
+
+    def signatures_of(self, token_sets):
+        """Signatures of many non-empty token sets at once, one row per set."""
+        hashed = np.array([zlib.crc32(token.encode()) for token_set in token_sets for token in token_set],
+                          dtype=np.uint64)
+        starts = np.cumsum([0] + [len(token_set) for token_set in token_sets[:-1]])
+        return np.minimum.reduceat((np.outer(hashed, self.a) + self.b) % PRIME, starts, axis=0).astype(np.uint32)
+
+    def candidates(self, token_set):
+        """Ids of the users sharing at least one band bucket with token_set."""
+        if not token_set:
+            return set()
+        keys = self.band_keys(self.signature(token_set))
+        found = set()
+        with self.lock:
+            for bucket, key in zip(self.buckets, keys):
+                found.update(bucket.get(key, ()))
+        return found
+
+    def query(self, token_set, k, exclude=None):
+        """Up to k (user_id, Jaccard similarity) pairs, most similar first, among the LSH candidates."""
+        found = self.candidates(token_set)
+        found.discard(exclude)
+        with self.lock:
+            scored = [(jaccard(token_set, self.token_sets[user_id]), -user_id) for user_id in found
+                      if user_id in self.token_sets]
+        return [(-negative_id, similarity) for similarity, negative_id in heapq.nlargest(k, scored) if similarity > 0]
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def _remove(self, user_id):
+        signature = self.signatures.pop(user_id, None)
+        self.token_sets.pop(user_id, None)
+        if signature is None:
+            return
+        for bucket, key in zip(self.buckets, self.band_keys(signature)):
+            members = bucket.get(key)
+            if members is not None:
+                members.discard(user_id)
+                if not members:
+                    del bucket[key]
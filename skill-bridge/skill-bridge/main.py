@@ -1,21 +1,100 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, Flask, Response, current_app, render_template, request, redirect, url_for, flash, jsonify, g, has_app_context, has_request_context, session
+from flask import abort, before_render_template, stream_with_context, template_rendered
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, TextAreaField, SelectField, SubmitField, BooleanField, SelectMultipleField, widgets
 from wtforms.validators import DataRequired, Email, Length, EqualTo, Optional
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event, Select
+from sqlalchemy.engine import Engine
 from datetime import datetime, timezone
+from typing import NamedTuple
+from urllib.parse import urlencode
+from functools import wraps
+from matching import parse_skills, calculate_skill_match, SkillMatchEngine
+from events import EventHub
+from pagecache import PageCache, LRUBackend, RedisBackend
+from metrics import Registry
+from autocomplete import PrefixIndex, normalize
+from lsh import MinHashLSH
+from concurrent.futures import ProcessPoolExecutor
+from importer import RowError
+import schema
+import synthetic
+import importer
+import lsh
+import ranking
+import numpy as np
+import storage
+import base64
+import click
+import hashlib
+import json
+import logging
 import os
+import re
+import secrets
+import threading
+import time
+import zlib
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.urandom(24)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///skillbridge.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db = SQLAlchemy(app)
+DEFAULT_CONFIG = {
+    'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 100,
+    # Raise instead of logging when a route goes over its SQL query budget (for tests)
+    'QUERY_BUDGET_STRICT': False,
+    # Rendered pages kept for anonymous visitors; set PAGE_CACHE_REDIS_URL to share them between workers
+    'PAGE_CACHE_ENABLED': True,
+    'PAGE_CACHE_SIZE': 512,
+    'PAGE_CACHE_REDIS_URL': os.environ.get('PAGE_CACHE_REDIS_URL'),
+    # Queries slower than this are logged with their endpoint (None turns it off), to SLOW_QUERY_LOG if set
+    'SLOW_QUERY_SECONDS': float(os.environ.get('SLOW_QUERY_SECONDS', 0.1)),
+    'SLOW_QUERY_LOG': os.environ.get('SLOW_QUERY_LOG'),
+    # Bearer token for the /api/v1/export endpoints; they answer 404 while it is unset
+    'EXPORT_TOKEN': os.environ.get('EXPORT_TOKEN'),
+    'EXPORT_BATCH_SIZE': 1000,
+    # Relative weight of each signal when ranking projects and people (see ranking.py)
+    'PROJECT_RANKING_WEIGHTS': ranking.PROJECT_WEIGHTS,
+    'USER_RANKING_WEIGHTS': ranking.USER_WEIGHTS,
+    'RECENCY_HALF_LIFE_DAYS': 30,
+    # MinHash LSH index for "people like you" (see lsh.py and bench_lsh.py); more bands of fewer rows
+    # find more of the truly similar users but score more candidates per lookup
+    'PEOPLE_INDEX_BANDS': 32,
+    'PEOPLE_INDEX_ROWS': 2,
+    # Below this many indexed users, collaborators are ranked exactly: scanning everyone sharing a skill is cheap
+    'PEOPLE_INDEX_MIN_USERS': 20000,
+    # How many of the most similar users are ranked for collaborator recommendations
+    'PEOPLE_INDEX_CANDIDATES': 500,
+    # A background thread rebuilds the index this often, to pick up the other workers' writes
+    'PEOPLE_INDEX_REFRESH_SECONDS': 300
+}
+
+class RoutingSession(Session):
+    """Session that sends the SELECTs of read-only views to the 'read' bind, when one is configured.
+
+    Once a read-only view writes (building a missing cache row, say), the rest
+    of its request reads from the primary, so that it sees its own writes
+    however far the replica lags.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and g.get('read_only') and 'read' in self._db.engines:
+            if self._flushing or (clause is not None and not isinstance(clause, Select)):
+                g.read_only = False
+            elif isinstance(clause, Select):
+                return self._db.engines['read']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
+login_manager.login_view = 'main.login'
+bp = Blueprint('main', __name__, cli_group=None)
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+# API clients get a 401 instead of a redirect to the login page
+login_manager.blueprint_login_views = {'api': None}
 
 # Custom widget for multiple checkboxes
 class MultiCheckboxField(SelectMultipleField):
@@ -84,8 +163,14 @@ class User(UserMixin, db.Model):
     profile_image = db.Column(db.String(200), default='https://i.pravatar.cc/150?img=0')
     experience_points = db.Column(db.Integer, default=0)
     average_rating = db.Column(db.Float, default=0.0)
+    # Running totals that experience_points and average_rating are derived from
+    rating_sum = db.Column(db.Float, nullable=False, default=0.0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    positive_review_count = db.Column(db.Integer, nullable=False, default=0)
+    completed_project_count = db.Column(db.Integer, nullable=False, default=0)
     github = db.Column(db.String(200))
     linkedin = db.Column(db.String(200))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     projects = db.relationship('Project', backref='creator', lazy=True)
     academic_projects = db.relationship('AcademicProject', backref='creator', lazy=True)
     reviews_received = db.relationship('Review', foreign_keys='Review.reviewee_id', backref='reviewee', lazy=True)
@@ -93,6 +178,8 @@ class User(UserMixin, db.Model):
     sent_messages = db.relationship('Message', foreign_keys='Message.sender_id', backref='sender', lazy=True)
     received_messages = db.relationship('Message', foreign_keys='Message.receiver_id', backref='receiver', lazy=True)
     sent_collaboration_requests = db.relationship('CollaborationRequest', foreign_keys='CollaborationRequest.sender_id', backref='sender', lazy=True)
+    skill_links = db.relationship('UserSkill', backref='user', lazy=True, cascade='all, delete-orphan')
+    memberships = db.relationship('ProjectMember', backref='user', lazy=True, cascade='all, delete-orphan')
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -100,19 +187,19 @@ class User(UserMixin, db.Model):
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
-    def update_experience_points(self):
-        completed_projects = Project.query.filter_by(creator_id=self.id, status='completed').count()
-        positive_reviews = Review.query.filter(Review.reviewee_id == self.id, Review.rating >= 4).count()
-        self.experience_points = (completed_projects * 20) + (positive_reviews * 5)
-        db.session.commit()
+    def set_aggregates(self, rating_sum, rating_count, positive_review_count, completed_project_count):
+        """Overwrite the running totals and the experience points and rating derived from them."""
+        self.rating_sum = rating_sum
+        self.rating_count = rating_count
+        self.positive_review_count = positive_review_count
+        self.completed_project_count = completed_project_count
+        self.experience_points = completed_project_count * XP_PER_COMPLETED_PROJECT + positive_review_count * XP_PER_POSITIVE_REVIEW
+        self.average_rating = rating_sum / rating_count if rating_count else 0.0
 
-    def update_average_rating(self):
-        reviews = Review.query.filter_by(reviewee_id=self.id).all()
-        if reviews:
-            self.average_rating = sum(review.rating for review in reviews) / len(reviews)
-        else:
-            self.average_rating = 0.0
-        db.session.commit()
+# Experience points awarded per completed project and per positive review
+XP_PER_COMPLETED_PROJECT = 20
+XP_PER_POSITIVE_REVIEW = 5
+POSITIVE_RATING = 4
 
 # Review model
 class Review(db.Model):
@@ -126,6 +213,10 @@ class Review(db.Model):
     feedback_tags = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        db.Index('ix_review_reviewee_id', 'reviewee_id'),
+    )
+
 # Project model with status field
 class Project(db.Model):
     """Project model representing a collaborative project."""
@@ -138,10 +229,81 @@ class Project(db.Model):
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     status = db.Column(db.String(20), default='active')  # active, completed, cancelled
-    collaborators = db.Column(db.String(500))  # Store user IDs of collaborators
     max_collaborators = db.Column(db.Integer, default=5)
     reviews = db.relationship('Review', backref='project', lazy=True)
     collaboration_requests = db.relationship('CollaborationRequest', backref='project', lazy=True)
+    skill_links = db.relationship('ProjectSkill', backref='project', lazy=True, cascade='all, delete-orphan')
+    members = db.relationship('ProjectMember', backref='project', lazy=True, cascade='all, delete-orphan')
+
+    __table_args__ = (
+        db.Index('ix_project_status_created', 'status', 'created_at'),
+        db.Index('ix_project_creator_id', 'creator_id'),
+    )
+
+    def member_count(self):
+        return ProjectMember.query.filter_by(project_id=self.id).count()
+
+    def has_member(self, user_id):
+        return ProjectMember.query.filter_by(project_id=self.id, user_id=user_id).first() is not None
+
+    def is_full(self):
+        return self.member_count() >= self.max_collaborators
+
+    def add_member(self, user_id, role='collaborator'):
+        """Add a user to the team unless they are already on it."""
+        if not self.has_member(user_id):
+            db.session.add(ProjectMember(project_id=self.id, user_id=user_id, role=role))
+
+# Project team membership
+class ProjectMember(db.Model):
+    """A user working on a project, with their role and when they joined."""
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True, index=True)
+    role = db.Column(db.String(20), nullable=False, default='collaborator')
+    joined_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+# Skill model (canonical, lower-cased skill names)
+class Skill(db.Model):
+    """Model for a canonical skill shared by users and projects."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    # How the skill was first spelled, e.g. 'UI Design' for 'ui design'
+    display_name = db.Column(db.String(100))
+
+# User/skill association
+class UserSkill(db.Model):
+    """Association between a user and one of their skills."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True, index=True)
+    skill = db.relationship('Skill')
+
+# Project/skill association
+class ProjectSkill(db.Model):
+    """Association between a project and one of its required skills."""
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True, index=True)
+    skill = db.relationship('Skill')
+
+# Alternative spellings of a skill or tag
+class SkillAlias(db.Model):
+    """A normalized spelling (e.g. 'ux design') that is saved as its canonical skill or tag instead."""
+    alias = db.Column(db.String(100), primary_key=True)
+    canonical = db.Column(db.String(100), nullable=False)
+
+# Stored recommendations for a user
+class RecommendationCache(db.Model):
+    """Ranked project and user matches for a user, dropped when skills change and rebuilt on the next read."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    project_ids = db.Column(db.JSON, default=list)
+    user_ids = db.Column(db.JSON, default=list)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+# Filter dropdown values with project counts
+class Facet(db.Model):
+    """A tag or skill offered in the project filters, with the number of projects using it."""
+    kind = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
 
 # Academic Project model
 class AcademicProject(db.Model):
@@ -170,6 +332,53 @@ class Message(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     is_read = db.Column(db.Boolean, default=False)
+    conversation_id = db.Column(db.Integer, db.ForeignKey('conversation.id'))
+
+    __table_args__ = (
+        db.Index('ix_message_conversation_created', 'conversation_id', 'created_at'),
+        db.Index('ix_message_receiver_read', 'receiver_id', 'is_read'),
+        db.Index('ix_message_sender_receiver_created', 'sender_id', 'receiver_id', 'created_at'),
+        # Only unread rows are indexed, so unread counts stay cheap however much mail is read
+        db.Index('ix_message_unread_receiver', 'receiver_id', 'sender_id',
+                 sqlite_where=db.text('is_read = 0'), postgresql_where=db.text('NOT is_read')),
+    )
+
+# Conversation between two users
+class Conversation(db.Model):
+    """Message thread between a pair of users, with its latest message and unread counts.
+
+    The pair is stored with the lower user id first so each pair has one row.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    user_low_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_high_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    last_message_id = db.Column(db.Integer)
+    last_message_at = db.Column(db.DateTime)
+    low_unread = db.Column(db.Integer, nullable=False, default=0)
+    high_unread = db.Column(db.Integer, nullable=False, default=0)
+    user_low = db.relationship('User', foreign_keys=[user_low_id])
+    user_high = db.relationship('User', foreign_keys=[user_high_id])
+    last_message = db.relationship('Message', primaryjoin='Conversation.last_message_id == Message.id',
+                                   foreign_keys=[last_message_id], viewonly=True)
+    messages = db.relationship('Message', backref='conversation', lazy='dynamic')
+
+    __table_args__ = (
+        db.UniqueConstraint('user_low_id', 'user_high_id'),
+        db.Index('ix_conversation_low_last', 'user_low_id', 'last_message_at'),
+        db.Index('ix_conversation_high_last', 'user_high_id', 'last_message_at'),
+    )
+
+    def other_user_id(self, user_id):
+        return self.user_high_id if user_id == self.user_low_id else self.user_low_id
+
+    def other_user(self, user_id):
+        return self.user_high if user_id == self.user_low_id else self.user_low
+
+    def unread_for(self, user_id):
+        return self.low_unread if user_id == self.user_low_id else self.high_unread
+
+    def unread_column(self, user_id):
+        return Conversation.low_unread if user_id == self.user_low_id else Conversation.high_unread
 
 # Collaboration request model
 class CollaborationRequest(db.Model):
@@ -180,51 +389,1063 @@ class CollaborationRequest(db.Model):
     message = db.Column(db.Text)
     status = db.Column(db.String(20), default='pending')  # pending, accepted, rejected
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.Index('ix_collaboration_request_project_status', 'project_id', 'status'),
+        db.Index('ix_collaboration_request_sender_created', 'sender_id', 'created_at'),
+    )
+
+# Number of projects and users kept in each user's recommendations
+RECOMMENDATION_LIMIT = 3
 
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
 
-def calculate_skill_match(user_skills, project_skills):
-    if not user_skills or not project_skills:
-        return 0
-    
-    # Convert comma-separated strings to sets of cleaned skills
-    user_skill_set = {skill.strip().lower() for skill in user_skills.split(',')}
-    project_skill_set = {skill.strip().lower() for skill in project_skills.split(',')}
-    
-    # Calculate intersection and union
-    matching_skills = user_skill_set.intersection(project_skill_set)
-    total_project_skills = len(project_skill_set)
-    
-    # Calculate match percentage based on project requirements met
-    if total_project_skills == 0:
-        return 0
-    
-    match_percentage = (len(matching_skills) / total_project_skills) * 100
-    return round(match_percentage)
+def epoch_seconds(value):
+    """Seconds since the epoch of a stored naive UTC datetime (0 for None)."""
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else 0
+
+class ProjectSnapshot(NamedTuple):
+    """The bitmask match engine and the other ranking inputs of the project catalog, built together."""
+    engine: SkillMatchEngine
+    catalog: ranking.ProjectCatalog
+
+# Per-process snapshot of the project catalog, replaced as a whole so that readers never mix two loads
+project_snapshot = ProjectSnapshot(SkillMatchEngine(), ranking.ProjectCatalog())
+project_snapshot_lock = threading.Lock()
+
+def get_project_snapshot():
+    """Return the project snapshot, building a new one if projects or teams changed since the current one."""
+    global project_snapshot
+    member_count = db.select(db.func.count()).select_from(ProjectMember).scalar_subquery()
+    version = tuple(db.session.query(db.func.count(Project.id), db.func.max(Project.updated_at), member_count).one())
+    with project_snapshot_lock:
+        snapshot = project_snapshot
+    if snapshot.engine.version == version:
+        return snapshot
+    members = db.select(ProjectMember.project_id, db.func.count().label('members')).group_by(
+        ProjectMember.project_id
+    ).subquery()
+    rows = db.session.query(
+        Project.id, Project.status, Project.created_at, Project.max_collaborators, members.c.members, Skill.name
+    ).outerjoin(members, members.c.project_id == Project.id).outerjoin(
+        ProjectSkill, ProjectSkill.project_id == Project.id
+    ).outerjoin(Skill, Skill.id == ProjectSkill.skill_id).order_by(Project.id)
+    projects, project_skills = [], {}
+    for project_id, status, created_at, max_collaborators, count, name in rows:
+        if project_id not in project_skills:
+            projects.append((project_id, status, epoch_seconds(created_at), max_collaborators, count or 0))
+            project_skills[project_id] = []
+        if name:
+            project_skills[project_id].append(name)
+    snapshot = ProjectSnapshot(SkillMatchEngine(), ranking.ProjectCatalog())
+    snapshot.engine.load(project_skills.items(), version)
+    snapshot.catalog.load(projects, version)
+    with project_snapshot_lock:
+        project_snapshot = snapshot
+    return snapshot
+
+# Names of the per-process indexes being rebuilt in a background thread
+rebuilding = set()
+rebuilding_lock = threading.Lock()
+
+def rebuild_in_background(name, load, *args):
+    """Run load(*args) in a thread with an app context, unless the index called name is already being rebuilt."""
+    with rebuilding_lock:
+        if name in rebuilding:
+            return
+        rebuilding.add(name)
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context():
+                load(*args)
+        finally:
+            with rebuilding_lock:
+                rebuilding.discard(name)
+    threading.Thread(target=run, daemon=True).start()
+
+# Per-process autocomplete indexes of canonical skills and project tags
+autocomplete_indexes = {'skill': PrefixIndex(), 'tag': PrefixIndex()}
+
+def autocomplete_version():
+    """Changes whenever any worker creates a skill, adds or drops a project tag, or adds or removes an alias."""
+    return tuple(db.session.query(
+        db.select(db.func.max(Skill.id)).scalar_subquery(),
+        db.select(db.func.count()).select_from(Facet).where(Facet.kind == 'tag').scalar_subquery(),
+        db.select(db.func.count()).select_from(SkillAlias).scalar_subquery()
+    ).one())
+
+def load_autocomplete_index(kind):
+    """Rebuild the kind's prefix index from the database, skills under their display spelling."""
+    version = autocomplete_version()
+    if kind == 'skill':
+        links = db.union_all(db.select(UserSkill.skill_id), db.select(ProjectSkill.skill_id)).subquery()
+        items = db.session.query(db.func.coalesce(Skill.display_name, Skill.name), db.func.count()).join(
+            links, links.c.skill_id == Skill.id
+        ).group_by(Skill.id)
+    else:
+        items = get_facets('tag')
+    autocomplete_indexes[kind].load(items, time.time(), version)
+
+def get_autocomplete_index(kind):
+    """Return the kind's prefix index.
+
+    Only its first build runs in the request. Afterwards the worker's own
+    writes update it in place, and when autocomplete_version() shows that a
+    name was created or removed elsewhere, a background thread rebuilds it
+    while the current one keeps answering.
+    """
+    index = autocomplete_indexes[kind]
+    if index.loaded_at is None:
+        load_autocomplete_index(kind)
+    elif index.version != autocomplete_version():
+        rebuild_in_background(f'autocomplete:{kind}', load_autocomplete_index, kind)
+    return index
+
+def autocomplete_changed(kind, value, delta):
+    """Queue a usage count change for the autocomplete index, applied when the session commits."""
+    db.session.info.setdefault('autocomplete', []).append((kind, value, delta))
+
+@event.listens_for(RoutingSession, 'after_commit')
+def apply_autocomplete_changes(session):
+    for kind, value, delta in session.info.pop('autocomplete', []):
+        if autocomplete_indexes[kind].loaded_at is not None:
+            autocomplete_indexes[kind].update(value, delta)
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def drop_autocomplete_changes(session):
+    session.info.pop('autocomplete', None)
+
+# Per-process MinHash LSH index of every user's skills and interests
+people_index = MinHashLSH(DEFAULT_CONFIG['PEOPLE_INDEX_BANDS'], DEFAULT_CONFIG['PEOPLE_INDEX_ROWS'])
+
+def load_people_index(index):
+    """Rebuild the people index, or leave it empty while there are fewer than PEOPLE_INDEX_MIN_USERS users."""
+    if db.session.query(db.func.count(User.id)).scalar() < current_app.config['PEOPLE_INDEX_MIN_USERS']:
+        index.load([], time.time())
+        return
+    rows = db.session.query(User.id, User.skills, User.interests).execution_options(yield_per=10000)
+    index.load(((user_id, lsh.tokens(skills, interests)) for user_id, skills, interests in rows), time.time())
+
+def get_people_index():
+    """Return the people index, or None until its first build finishes.
+
+    Builds never run in the request: a background thread builds the index on
+    first use, every PEOPLE_INDEX_REFRESH_SECONDS, and after
+    mark_people_index_stale(), while the current one keeps answering. Below
+    PEOPLE_INDEX_MIN_USERS users it only counts them and stays empty.
+    """
+    global people_index
+    config = current_app.config
+    if (people_index.bands, people_index.rows) != (config['PEOPLE_INDEX_BANDS'], config['PEOPLE_INDEX_ROWS']):
+        people_index = MinHashLSH(config['PEOPLE_INDEX_BANDS'], config['PEOPLE_INDEX_ROWS'])
+    if people_index.loaded_at is None or time.time() - people_index.loaded_at > config['PEOPLE_INDEX_REFRESH_SECONDS']:
+        rebuild_in_background('people', load_people_index, people_index)
+    return people_index if people_index.loaded_at is not None else None
+
+def mark_people_index_stale():
+    """Have the people index rebuilt on its next use, without dropping the one that is answering."""
+    if people_index.loaded_at is not None:
+        people_index.loaded_at = 0
+
+@event.listens_for(RoutingSession, 'after_flush')
+def apply_people_index_changes(session, flush_context):
+    """Re-index the users whose skills or interests were just written.
+
+    This happens at flush rather than commit so that recommendations refreshed
+    in the same transaction already see the change; a rollback has the index
+    rebuilt instead. An empty index is one kept empty below
+    PEOPLE_INDEX_MIN_USERS, and stays so.
+    """
+    if people_index.loaded_at is None or not len(people_index):
+        return
+    for user in session.new | session.dirty:
+        if isinstance(user, User) and (user in session.new or any(
+                db.inspect(user).attrs[name].history.has_changes() for name in ('skills', 'interests'))):
+            people_index.add(user.id, lsh.tokens(user.skills, user.interests))
+            session.info['people_index_changed'] = True
+    for user in session.deleted:
+        if isinstance(user, User):
+            people_index.remove(user.id)
+            session.info['people_index_changed'] = True
+
+@event.listens_for(RoutingSession, 'after_commit')
+def keep_people_index_changes(session):
+    session.info.pop('people_index_changed', None)
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def undo_people_index_changes(session):
+    if session.info.pop('people_index_changed', None):
+        mark_people_index_stale()
+
+def alias_map(texts):
+    """{alias: canonical} for every term in the given comma-separated strings that has an alias."""
+    terms = {normalize(term) for text in texts for term in (text or '').split(',')} - {''}
+    if not terms:
+        return {}
+    return dict(db.session.query(SkillAlias.alias, SkillAlias.canonical).filter(SkillAlias.alias.in_(terms)))
+
+def normalize_terms(text, aliases=None):
+    """Clean a comma-separated skills or tags string before it is saved.
+
+    Whitespace is collapsed, aliased spellings are replaced by their canonical
+    name and repeats (in any case) are dropped. aliases is an alias_map() for
+    the text; it is looked up when not given.
+    """
+    aliases = alias_map([text]) if aliases is None else aliases
+    terms = {}
+    for term in (' '.join(term.split()) for term in (text or '').split(',')):
+        if term:
+            term = aliases.get(normalize(term), term)
+            terms.setdefault(term.lower(), term)
+    return ', '.join(terms.values())
+
+def skill_spellings(*texts):
+    """{canonical name: spelling as typed} for the skills in comma-separated strings, first spelling kept."""
+    spellings = {}
+    for text in texts:
+        for term in (text or '').split(','):
+            if term.strip():
+                spellings.setdefault(term.strip().lower(), term.strip())
+    return spellings
+
+def get_or_create_skills(names, spellings=None):
+    """Return Skill rows for the given canonical names, creating any that are missing.
+
+    spellings maps names to the display spelling that new rows are saved with.
+    """
+    if not names:
+        return []
+    skills = {skill.name: skill for skill in Skill.query.filter(Skill.name.in_(names)).all()}
+    for name in names:
+        if name not in skills:
+            skills[name] = Skill(name=name, display_name=(spellings or {}).get(name))
+            db.session.add(skills[name])
+    return list(skills.values())
+
+def _sync_skill_links(links, names, make_link):
+    """Add and remove association rows so that links covers exactly the given skill names."""
+    wanted = parse_skills(names)
+    for link in list(links):
+        if link.skill.name not in wanted:
+            links.remove(link)
+            autocomplete_changed('skill', link.skill.display_name or link.skill.name, -1)
+    existing = {link.skill.name for link in links}
+    for skill in get_or_create_skills(wanted - existing, skill_spellings(names)):
+        links.append(make_link(skill))
+        autocomplete_changed('skill', skill.display_name or skill.name, 1)
+
+def set_user_skills(user):
+    """Keep the user's UserSkill rows in step with the User.skills string."""
+    _sync_skill_links(user.skill_links, user.skills, lambda skill: UserSkill(skill=skill))
+
+def set_project_skills(project):
+    """Keep the project's ProjectSkill rows in step with the Project.required_skills string."""
+    _sync_skill_links(project.skill_links, project.required_skills, lambda skill: ProjectSkill(skill=skill))
+
+# Facet kinds and the Project column each one is read from
+FACET_COLUMNS = {'tag': 'tags', 'skill': 'required_skills'}
+
+def project_facets(project):
+    """The set of (kind, value) facets a project contributes to the filter dropdowns."""
+    facets = set()
+    for kind, column in FACET_COLUMNS.items():
+        values = getattr(project, column) or ''
+        facets.update((kind, value.strip()) for value in values.split(',') if value.strip())
+    return facets
+
+def update_facets(old, new):
+    """Move facet counts from a project's old facets to its new ones."""
+    for kind, value in new - old:
+        updated = Facet.query.filter_by(kind=kind, value=value).update({Facet.count: Facet.count + 1})
+        if not updated:
+            db.session.add(Facet(kind=kind, value=value, count=1))
+        if kind == 'tag':
+            autocomplete_changed('tag', value, 1)
+    removed = old - new
+    for kind, value in removed:
+        Facet.query.filter_by(kind=kind, value=value).update({Facet.count: Facet.count - 1})
+        if kind == 'tag':
+            autocomplete_changed('tag', value, -1)
+    if removed:
+        Facet.query.filter(Facet.count <= 0).delete()
+
+def rebuild_facets():
+    """Recount every facet from the project table."""
+    counts = {}
+    for project in Project.query.with_entities(Project.tags, Project.required_skills).yield_per(500):
+        for facet in project_facets(project):
+            counts[facet] = counts.get(facet, 0) + 1
+    Facet.query.delete()
+    db.session.add_all(Facet(kind=kind, value=value, count=count) for (kind, value), count in counts.items())
+    db.session.commit()
+    autocomplete_indexes['tag'].version = None
+
+def get_facets(kind):
+    """(value, count) pairs for one facet kind, sorted by value."""
+    return Facet.query.with_entities(Facet.value, Facet.count).filter_by(kind=kind).order_by(Facet.value).all()
+
+def member_projects(user_id):
+    """Projects the user has joined as a team member, most recently joined first."""
+    return Project.query.join(ProjectMember, ProjectMember.project_id == Project.id).filter(
+        ProjectMember.user_id == user_id
+    ).order_by(ProjectMember.joined_at.desc(), Project.id.desc())
+
+def adjust_user_aggregates(user_ids, rating_sum=0, rating_count=0, positive_reviews=0, completed_projects=0):
+    """Add deltas to the running totals of the given users in a single UPDATE.
+
+    experience_points and average_rating are rederived in the same statement, so
+    the change is applied inside the caller's transaction and costs the same
+    however many reviews or projects a user already has.
+    """
+    if not user_ids or not any((rating_sum, rating_count, positive_reviews, completed_projects)):
+        return
+    new_sum = User.rating_sum + rating_sum
+    new_count = User.rating_count + rating_count
+    new_positive = User.positive_review_count + positive_reviews
+    new_completed = User.completed_project_count + completed_projects
+    User.query.filter(User.id.in_(user_ids)).update({
+        User.rating_sum: new_sum,
+        User.rating_count: new_count,
+        User.positive_review_count: new_positive,
+        User.completed_project_count: new_completed,
+        User.experience_points: new_completed * XP_PER_COMPLETED_PROJECT + new_positive * XP_PER_POSITIVE_REVIEW,
+        User.average_rating: db.case((new_count > 0, new_sum / new_count), else_=0.0)
+    }, synchronize_session='fetch')
+
+def completed_status_change(old_status, new_status):
+    """+1, -1 or 0: how a status change moves the creator's completed-project count."""
+    return int(new_status == 'completed') - int(old_status == 'completed')
+
+def compute_user_aggregates():
+    """Recount every user's running totals from the review and project tables.
+
+    Returns {user_id: (rating_sum, rating_count, positive_review_count, completed_project_count)}.
+    """
+    reviews = db.session.query(
+        Review.reviewee_id,
+        db.func.sum(Review.rating),
+        db.func.count(Review.id),
+        db.func.sum(db.case((Review.rating >= POSITIVE_RATING, 1), else_=0))
+    ).group_by(Review.reviewee_id)
+    completed = db.session.query(Project.creator_id, db.func.count(Project.id)).filter(
+        Project.status == 'completed'
+    ).group_by(Project.creator_id)
+    totals = {user_id: [0.0, 0, 0, 0] for (user_id,) in db.session.query(User.id)}
+    for user_id, rating_sum, rating_count, positive in reviews:
+        if user_id in totals:
+            totals[user_id][:3] = [float(rating_sum or 0), rating_count, int(positive or 0)]
+    for user_id, count in completed:
+        if user_id in totals:
+            totals[user_id][3] = count
+    return {user_id: tuple(values) for user_id, values in totals.items()}
+
+def verify_user_aggregates(fix=False):
+    """Compare stored running totals with a full recount; returns the users that drifted.
+
+    With fix=True the drifted users are rewritten from the recount.
+    """
+    drifted = []
+    users = {user.id: user for user in User.query.all()}
+    for user_id, expected in compute_user_aggregates().items():
+        user = users[user_id]
+        stored = (user.rating_sum, user.rating_count, user.positive_review_count, user.completed_project_count)
+        same = abs((stored[0] or 0) - expected[0]) < 1e-9 and tuple(stored[1:]) == expected[1:]
+        if not same:
+            drifted.append((user, stored, expected))
+            if fix:
+                user.set_aggregates(*expected)
+    if fix:
+        db.session.commit()
+    return drifted
+
+def get_conversation(user_id, other_id, create=False):
+    """The conversation between two users, optionally creating it."""
+    low, high = sorted((int(user_id), int(other_id)))
+    conversation = Conversation.query.filter_by(user_low_id=low, user_high_id=high).first()
+    if conversation is None and create:
+        conversation = Conversation(user_low_id=low, user_high_id=high)
+        db.session.add(conversation)
+        db.session.flush()
+    return conversation
+
+def deliver_message(sender_id, receiver_id, content):
+    """Store a message and move its conversation's last-message pointer and the receiver's unread count."""
+    conversation = get_conversation(sender_id, receiver_id, create=True)
+    message = Message(sender_id=sender_id, receiver_id=receiver_id, content=content, conversation_id=conversation.id)
+    db.session.add(message)
+    db.session.flush()
+    unread = conversation.unread_column(int(receiver_id))
+    Conversation.query.filter_by(id=conversation.id).update({
+        Conversation.last_message_id: message.id,
+        Conversation.last_message_at: message.created_at,
+        unread: unread + 1
+    }, synchronize_session='fetch')
+    return message
+
+def mark_conversation_read(conversation, user_id):
+    """Mark everything the user received in a conversation as read with one UPDATE and reset their counter."""
+    Message.query.filter(
+        Message.receiver_id == user_id,
+        Message.sender_id == conversation.other_user_id(user_id),
+        Message.is_read == False
+    ).update({Message.is_read: True}, synchronize_session=False)
+    Conversation.query.filter_by(id=conversation.id).update(
+        {conversation.unread_column(user_id): 0}, synchronize_session='fetch'
+    )
+
+def unread_counts(user_id):
+    """(sender_id, username, count) for each user with unread messages to user_id."""
+    counts = db.session.query(Message.sender_id, db.func.count().label('unread')).filter(
+        Message.receiver_id == user_id, Message.is_read == False
+    ).group_by(Message.sender_id).subquery()
+    return db.session.query(counts.c.sender_id, User.username, counts.c.unread).join(
+        User, User.id == counts.c.sender_id
+    ).order_by(counts.c.unread.desc(), User.username).all()
+
+# Live updates pushed to users' open /events streams
+event_hub = EventHub()
+EVENT_KEEPALIVE_SECONDS = 15
+
+def publish_message(message):
+    """Push a committed message to the receiver's open event streams."""
+    event_hub.publish(int(message.receiver_id), 'message', {
+        'id': message.id,
+        'conversation_id': message.conversation_id,
+        'sender_id': message.sender_id,
+        'sender': message.sender.username,
+        'content': message.content,
+        'created_at': message.created_at.isoformat()
+    })
+
+def publish_collaboration_request(collab_request, user_id):
+    """Push a new or answered collaboration request to user_id's open event streams."""
+    event_hub.publish(user_id, 'collaboration_request', {
+        'id': collab_request.id,
+        'project_id': collab_request.project_id,
+        'project': collab_request.project.title,
+        'sender': collab_request.sender.username,
+        'status': collab_request.status
+    })
+
+def inbox_query(user_id):
+    """The user's conversations with their latest message and both participants loaded."""
+    return Conversation.query.options(
+        db.joinedload(Conversation.last_message),
+        db.joinedload(Conversation.user_low),
+        db.joinedload(Conversation.user_high)
+    ).filter(db.or_(Conversation.user_low_id == user_id, Conversation.user_high_id == user_id),
+             Conversation.last_message_id.isnot(None))
+
+def upgrade_database():
+    """Create a new database at the latest schema version, or migrate an existing one in place."""
+    with db.engine.connect() as connection:
+        versioned = schema.current_version(connection) is not None
+        empty = not db.inspect(connection).has_table('user')
+    if not versioned and empty:
+        db.create_all()
+        schema.stamp(db.engine, schema.head())
+        return []
+    return schema.upgrade(db.engine)
+
+def backfill_skill_index():
+    """Populate the skill tables from the existing comma-separated columns."""
+    for user in User.query.all():
+        set_user_skills(user)
+    for project in Project.query.all():
+        set_project_skills(project)
+    # Stored recommendations were ranked against the old index
+    RecommendationCache.query.delete()
+    db.session.commit()
+    autocomplete_indexes['skill'].version = None
+
+def ranking_now():
+    """The time recency is measured from, truncated to the hour so that scores and page cursors stay stable."""
+    return datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0).timestamp()
+
+def rank_projects(user_skills, limit, candidates=None, after=None, matching_only=False, active_only=False, snapshot=None):
+    """The limit best projects for someone with user_skills, as ranking.Ranked tuples.
+
+    candidates restricts the ranking to the given project ids, after is a
+    (score, project_id) keyset cursor, matching_only drops projects sharing no
+    skill with the user and active_only drops projects that are not active.
+    """
+    engine, catalog = snapshot or get_project_snapshot()
+    skill_match = engine.scores(user_skills) / 100
+    mask = np.ones(len(engine.project_ids), dtype=bool)
+    if candidates is not None:
+        mask &= np.isin(engine.project_ids, np.fromiter(candidates, dtype=np.int64))
+    if matching_only:
+        mask &= skill_match > 0
+    if active_only:
+        mask &= catalog.active
+    signals = catalog.signals(skill_match, ranking_now(), current_app.config['RECENCY_HALF_LIFE_DAYS'])
+    return ranking.rank(engine.project_ids, signals, current_app.config['PROJECT_RANKING_WEIGHTS'], limit, mask, after)
+
+def similar_user_ids(user_id, limit):
+    """Ids of up to limit users with skills and interests most like the user's, most similar first.
+
+    The people index only scores users sharing an LSH bucket with the user, so a
+    few of the truly most similar users may be missed (see bench_lsh.py).
+    Returns None when the index is not built yet, does not hold the user, or
+    holds fewer than PEOPLE_INDEX_MIN_USERS users.
+    """
+    index = get_people_index()
+    if index is None or len(index) < current_app.config['PEOPLE_INDEX_MIN_USERS']:
+        return None
+    own = index.get(user_id)
+    if own is None:
+        return None
+    return [other_id for other_id, _ in index.query(own, limit, exclude=user_id)]
+
+def rank_users(user_id, limit, candidates=None):
+    """The limit best collaborators for a user among those sharing a skill with them, as ranking.Ranked tuples.
+
+    Without candidates, large catalogs only rank the users the people index
+    finds most similar. Everyone sharing a skill is ranked instead when
+    similar_user_ids() has no answer or fewer than limit of the users it
+    returns share a skill with the user.
+    """
+    if candidates is None:
+        similar = similar_user_ids(user_id, current_app.config['PEOPLE_INDEX_CANDIDATES'])
+        if similar is not None:
+            ranked = _rank_users(user_id, limit, similar)
+            if len(ranked) >= limit:
+                return ranked
+    return _rank_users(user_id, limit, candidates)
+
+def _rank_users(user_id, limit, candidates):
+    mine = db.aliased(UserSkill)
+    theirs = db.aliased(UserSkill)
+    own_skills = db.select(db.func.count()).where(UserSkill.user_id == user_id).scalar_subquery()
+    shared = db.session.query(
+        theirs.user_id, db.func.count().label('shared')
+    ).join(mine, mine.skill_id == theirs.skill_id).filter(
+        mine.user_id == user_id,
+        theirs.user_id != user_id
+    )
+    if candidates is not None:
+        shared = shared.filter(theirs.user_id.in_(candidates))
+    shared = shared.group_by(theirs.user_id).subquery()
+    rows = db.session.query(
+        shared.c.user_id, shared.c.shared * 1.0 / own_skills, User.experience_points, User.average_rating
+    ).join(User, User.id == shared.c.user_id).all()
+    if not rows:
+        return []
+    ids, overlap, points, ratings = (np.array(column, dtype=np.float64) for column in zip(*rows))
+    signals = {
+        'skill_overlap': np.clip(overlap, 0, 1),
+        'experience': ranking.experience(points),
+        'rating': ranking.rating(ratings)
+    }
+    return ranking.rank(ids, signals, current_app.config['USER_RANKING_WEIGHTS'], limit)
+
+def load_in_order(model, ids, *options):
+    """Load rows of model by primary key, keeping the order of ids and skipping missing rows."""
+    if not ids:
+        return []
+    rows = {row.id: row for row in model.query.options(*options).filter(model.id.in_(ids)).all()}
+    return [rows[row_id] for row_id in ids if row_id in rows]
+
+def users_with_skills(names):
+    """Ids of users holding any of the given canonical skill names."""
+    if not names:
+        return set()
+    rows = db.session.query(UserSkill.user_id).join(Skill).filter(Skill.name.in_(names)).distinct()
+    return {row.user_id for row in rows}
+
+def skills_of_users(user_ids):
+    """Canonical skill names held by any of the given users."""
+    if not user_ids:
+        return set()
+    return {name for (name,) in db.session.query(Skill.name).join(UserSkill).filter(UserSkill.user_id.in_(user_ids)).distinct()}
+
+def refresh_recommendations(user_ids):
+    """Recompute the stored recommendations for each of the given users."""
+    if not user_ids:
+        return
+    snapshot = get_project_snapshot()
+    skills = dict(db.session.query(User.id, User.skills).filter(User.id.in_(user_ids)))
+    for user_id in user_ids:
+        project_ids = [ranked.id for ranked in rank_projects(
+            skills.get(user_id), RECOMMENDATION_LIMIT, matching_only=True, active_only=True, snapshot=snapshot
+        )]
+        # Rank before touching the row, so that it is written once rather than autoflushed in between
+        similar_ids = [ranked.id for ranked in rank_users(user_id, RECOMMENDATION_LIMIT)]
+        cache = db.session.get(RecommendationCache, user_id)
+        if cache is None:
+            cache = RecommendationCache(user_id=user_id)
+            db.session.add(cache)
+        cache.project_ids = project_ids
+        cache.user_ids = similar_ids
+        cache.updated_at = datetime.now(timezone.utc)
+
+def invalidate_recommendations(skill_names, user_ids=()):
+    """Drop the stored recommendations of everyone affected by a change to the given skills.
+
+    Nothing is ranked here: each dropped row is rebuilt on its user's next read.
+    """
+    if not skill_names and not user_ids:
+        return
+    db.session.flush()
+    holders = db.select(UserSkill.user_id).join(Skill).where(Skill.name.in_(skill_names))
+    RecommendationCache.query.filter(db.or_(
+        RecommendationCache.user_id.in_(holders), RecommendationCache.user_id.in_(list(user_ids))
+    )).delete(synchronize_session=False)
+
+def refresh_stored_recommendations(user_id):
+    refresh_recommendations([user_id])
+    db.session.commit()
+
+def recommendation_cache(user_id):
+    """The user's stored recommendations row, building it if needed.
+
+    Only a missing row is built in the request. Recency scores move every
+    hour, so a row ranked before the current hour is served as it is while a
+    background thread ranks it again.
+    """
+    cache = db.session.get(RecommendationCache, user_id)
+    if cache is None:
+        refresh_stored_recommendations(user_id)
+        cache = db.session.get(RecommendationCache, user_id)
+    elif epoch_seconds(cache.updated_at) < ranking_now():
+        rebuild_in_background(f'recommendations:{user_id}', refresh_stored_recommendations, user_id)
+    return cache
+
+def get_cached_recommendations(user_id):
+    """Return (projects, users) from the user's stored recommendations, building them if needed."""
+    cache = recommendation_cache(user_id)
+    return load_in_order(Project, cache.project_ids, db.joinedload(Project.creator)), load_in_order(User, cache.user_ids)
+
+# Full-text search indexes over these tables, kept in sync by triggers
+SEARCH_INDEXES = {
+    'project_fts': {
+        'table': 'project',
+        'columns': ['title', 'description', 'required_skills', 'tags'],
+        'weights': [10.0, 1.0, 5.0, 3.0]
+    },
+    'user_fts': {
+        'table': 'user',
+        'columns': ['username', 'skills', 'bio'],
+        'weights': [10.0, 5.0, 1.0]
+    }
+}
+
+def search_enabled():
+    """Full-text search uses SQLite FTS5; other databases fall back to ilike filters."""
+    return db.engine.dialect.name == 'sqlite'
+
+def setup_search_index(rebuild=False):
+    """Create the FTS5 tables and their triggers, rebuilding any index that was missing."""
+    if not search_enabled():
+        return
+    with db.engine.begin() as connection:
+        existing = {row[0] for row in connection.execute(db.text(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+        ))}
+        for name, index in SEARCH_INDEXES.items():
+            table = index['table']
+            columns = ', '.join(index['columns'])
+            new_values = ', '.join(f'new.{column}' for column in index['columns'])
+            old_values = ', '.join(f'old.{column}' for column in index['columns'])
+            statements = {
+                name: f"""CREATE VIRTUAL TABLE {name} USING fts5({columns}, content='{table}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+                f'{name}_insert': f"""CREATE TRIGGER {name}_insert AFTER INSERT ON "{table}" BEGIN
+                    INSERT INTO {name}(rowid, {columns}) VALUES (new.id, {new_values});
+                END""",
+                f'{name}_delete': f"""CREATE TRIGGER {name}_delete AFTER DELETE ON "{table}" BEGIN
+                    INSERT INTO {name}({name}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                END""",
+                f'{name}_update': f"""CREATE TRIGGER {name}_update AFTER UPDATE OF {columns} ON "{table}" BEGIN
+                    INSERT INTO {name}({name}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {name}(rowid, {columns}) VALUES (new.id, {new_values});
+                END"""
+            }
+            missing = [key for key in statements if key not in existing]
+            for key in missing:
+                connection.execute(db.text(statements[key]))
+            if missing or rebuild:
+                connection.execute(db.text(f"INSERT INTO {name}({name}) VALUES ('rebuild')"))
+
+def to_search_query(text):
+    """Turn free text into an FTS5 prefix query, e.g. 'ui des' -> '"ui"* "des"*'."""
+    return ' '.join(f'"{token}"*' for token in re.findall(r'\w+', text.lower()))
+
+def apply_text_search(query, model, index, text, columns):
+    """Filter a query to rows matching text.
+
+    Returns the filtered query and its BM25 score column (lower is more relevant),
+    or None for the score when falling back to ilike filters.
+    """
+    search_query = to_search_query(text)
+    if not search_enabled() or not search_query:
+        return query.filter(db.or_(*[column.ilike(f'%{text}%') for column in columns])), None
+    weights = ', '.join(str(weight) for weight in SEARCH_INDEXES[index]['weights'])
+    matches = db.text(
+        f'SELECT rowid AS id, bm25({index}, {weights}) AS score FROM {index} WHERE {index} MATCH :search_query'
+    ).bindparams(search_query=search_query).columns(id=db.Integer, score=db.Float).subquery()
+    return query.join(matches, matches.c.id == model.id), matches.c.score
+
+def get_page_size():
+    """Page size from the per_page argument, capped at MAX_PAGE_SIZE."""
+    size = request.args.get('per_page', current_app.config['PAGE_SIZE'], type=int)
+    return max(1, min(size, current_app.config['MAX_PAGE_SIZE']))
+
+def encode_cursor(values):
+    """Encode the sort key values of the last row on a page as an opaque cursor."""
+    payload = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, length):
+    """Decode a cursor into its list of values, or None if it is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    return values
+
+def paginate_keyset(query, keys, cursor=None, page_size=None):
+    """Fetch one page of query, ordered by keys, starting after cursor.
+
+    keys is a list of (column, descending) pairs; the last column must be unique
+    so that every row has a distinct position. Returns (rows, next_cursor), with
+    next_cursor None on the last page.
+    """
+    page_size = page_size or get_page_size()
+    values = decode_cursor(cursor, len(keys))
+    if values is not None:
+        try:
+            values = [
+                datetime.fromisoformat(value) if isinstance(column.type, db.DateTime) else value
+                for (column, _), value in zip(keys, values)
+            ]
+        except (TypeError, ValueError):
+            values = None
+    if values is not None:
+        # Rows strictly after the cursor in (key1, key2, ...) order
+        conditions = []
+        for position, (column, descending) in enumerate(keys):
+            ties = [keys[earlier][0] == values[earlier] for earlier in range(position)]
+            beyond = column < values[position] if descending else column > values[position]
+            conditions.append(db.and_(*ties, beyond))
+        query = query.filter(db.or_(*conditions))
+    query = query.order_by(None).order_by(*[column.desc() if descending else column.asc() for column, descending in keys])
+    rows = query.add_columns(*[column for column, _ in keys]).limit(page_size + 1).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(list(rows[-1][1:]))
+    return [row[0] for row in rows], next_cursor
+
+@bp.app_template_global()
+def page_url(**cursors):
+    """URL of the current page with the given cursor arguments replaced."""
+    args = request.args.to_dict()
+    args.update(cursors)
+    return url_for(request.endpoint, **request.view_args, **args)
+
+def paginate_by_match(user_skills, cursor=None, page_size=None, query=None):
+    """Fetch one page of projects in ranking order, optionally limited to query's projects."""
+    page_size = page_size or get_page_size()
+    candidates = None
+    if query is not None:
+        candidates = [row.id for row in query.order_by(None).with_entities(Project.id)]
+    after = decode_cursor(cursor, 2)
+    if after is not None and not all(isinstance(value, (int, float)) for value in after):
+        after = None
+    ranked = rank_projects(user_skills, page_size + 1, candidates, after)
+    next_cursor = None
+    if len(ranked) > page_size:
+        ranked = ranked[:page_size]
+        next_cursor = encode_cursor([ranked[-1].score, ranked[-1].id])
+    return load_in_order(Project, [result.id for result in ranked], db.joinedload(Project.creator)), next_cursor
+
+# JSON serializers shared by the API and the format=json pages
+def isoformat(value):
+    return value.isoformat() if value else None
+
+def serialize_user_summary(user):
+    return {'id': user.id, 'username': user.username}
+
+def serialize_user(user):
+    return {
+        'id': user.id,
+        'username': user.username,
+        'major': user.major,
+        'skills': user.skills,
+        'interests': user.interests,
+        'bio': user.bio,
+        'profile_image': user.profile_image,
+        'experience_points': user.experience_points,
+        'average_rating': user.average_rating,
+        'github': user.github,
+        'linkedin': user.linkedin
+    }
+
+def serialize_project(project):
+    return {
+        'id': project.id,
+        'title': project.title,
+        'description': project.description,
+        'required_skills': project.required_skills,
+        'tags': project.tags,
+        'status': project.status,
+        'max_collaborators': project.max_collaborators,
+        'created_at': isoformat(project.created_at),
+        'updated_at': isoformat(project.updated_at),
+        'creator': serialize_user_summary(project.creator)
+    }
+
+def serialize_message(message):
+    return {
+        'id': message.id,
+        'sender_id': message.sender_id,
+        'receiver_id': message.receiver_id,
+        'content': message.content,
+        'created_at': isoformat(message.created_at),
+        'is_read': message.is_read
+    }
+
+def serialize_conversation(conversation, user_id):
+    return {
+        'id': conversation.id,
+        'other_user': serialize_user_summary(conversation.other_user(user_id)),
+        'unread': conversation.unread_for(user_id),
+        'last_message_at': isoformat(conversation.last_message_at),
+        'last_message': serialize_message(conversation.last_message) if conversation.last_message else None
+    }
+
+def serialize_collaboration_request(collab_request):
+    return {
+        'id': collab_request.id,
+        'status': collab_request.status,
+        'message': collab_request.message,
+        'created_at': isoformat(collab_request.created_at),
+        'updated_at': isoformat(collab_request.updated_at),
+        'project': {'id': collab_request.project.id, 'title': collab_request.project.title},
+        'sender': serialize_user_summary(collab_request.sender)
+    }
+
+# Conditional GET for JSON responses
+def serialize_ranked(data, ranked):
+    """Add a ranking.Ranked score and its per-signal breakdown to a serialized row."""
+    if ranked is None:
+        return data
+    return dict(data, score=round(ranked.score, 4), score_breakdown=ranked.breakdown)
+
+def serialize_recommendations(user, projects, users):
+    """Recommended projects and users, each with the score breakdown that ranked it."""
+    project_scores = {ranked.id: ranked for ranked in rank_projects(user.skills, len(projects), [project.id for project in projects])}
+    user_scores = {ranked.id: ranked for ranked in rank_users(user.id, len(users), [other.id for other in users])}
+    return {'projects': [serialize_ranked(serialize_project(project), project_scores.get(project.id)) for project in projects],
+            'users': [serialize_ranked(serialize_user(other), user_scores.get(other.id)) for other in users]}
+
+def rows_version(query, updated_column):
+    """(row count, latest update) of a query; changes whenever one of its rows is added, removed or edited."""
+    count, updated = query.with_entities(db.func.count(), db.func.max(updated_column)).one()
+    return [count, isoformat(updated)]
+
+def conditional_json(version, build):
+    """JSON from build(), or an empty 304 when the client's If-None-Match already names this version.
+
+    The weak ETag is a hash of version, so build is only called, and the rows
+    only loaded, when the data changed since the client last fetched it.
+    """
+    etag = hashlib.sha1(json.dumps(version, default=str).encode()).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag, weak=True)
+    # Responses depend on the logged-in user: cache privately and always revalidate
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a request runs more SQL queries than its route allows."""
+
+# Per-process metrics, served at /metrics
+metrics_registry = Registry()
+request_seconds = metrics_registry.histogram(
+    'skillbridge_request_duration_seconds', 'Time to build a response, by endpoint.', ['endpoint', 'method'])
+requests_total = metrics_registry.counter(
+    'skillbridge_requests_total', 'Responses sent, by endpoint and status.', ['endpoint', 'method', 'status'])
+sql_queries_per_request = metrics_registry.histogram(
+    'skillbridge_sql_queries_per_request', 'SQL queries run by a request, by endpoint.', ['endpoint'],
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64, 128))
+sql_query_seconds = metrics_registry.histogram(
+    'skillbridge_sql_query_duration_seconds', 'Time spent in each SQL query, by endpoint.', ['endpoint'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+slow_queries_total = metrics_registry.counter(
+    'skillbridge_slow_queries_total', 'SQL queries over SLOW_QUERY_SECONDS, by endpoint.', ['endpoint'])
+template_render_seconds = metrics_registry.histogram(
+    'skillbridge_template_render_seconds', 'Time to render a Jinja template, by template.', ['template'])
+slow_query_log = logging.getLogger('skillbridge.slow_queries')
+
+def metric_endpoint():
+    """The endpoint label: 'unmatched' for requests no route matched, 'none' outside requests."""
+    if not has_request_context():
+        return 'none'
+    return request.endpoint or 'unmatched'
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+    if has_app_context() and 'query_count' in g:
+        g.query_count += 1
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def time_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    endpoint = metric_endpoint()
+    sql_query_seconds.observe(seconds, endpoint=endpoint)
+    # Bulk loads from the command line are expected to be slow; only requests are logged
+    threshold = current_app.config['SLOW_QUERY_SECONDS'] if has_request_context() else None
+    if threshold is not None and seconds >= threshold:
+        slow_queries_total.inc(endpoint=endpoint)
+        slow_query_log.warning('%.1f ms in %s: %s', seconds * 1000, endpoint, ' '.join(statement.split()))
+
+@event.listens_for(Engine, 'handle_error')
+def drop_query_timer(context):
+    # after_cursor_execute does not run for a failed query
+    if context.connection is not None and context.connection.info.get('query_started'):
+        context.connection.info['query_started'].pop()
+
+@before_render_template.connect
+def start_template_timer(app, template, context, **extra):
+    g.setdefault('template_started', []).append(time.perf_counter())
+
+@template_rendered.connect
+def time_template(app, template, context, **extra):
+    if g.get('template_started'):
+        template_render_seconds.observe(time.perf_counter() - g.template_started.pop(), template=template.name)
+
+@bp.before_app_request
+def start_query_count():
+    g.query_count = 0
+    g.request_started = time.perf_counter()
+
+@bp.after_app_request
+def record_request_metrics(response):
+    endpoint = metric_endpoint()
+    if 'request_started' in g:
+        request_seconds.observe(time.perf_counter() - g.request_started, endpoint=endpoint, method=request.method)
+        sql_queries_per_request.observe(g.query_count, endpoint=endpoint)
+    requests_total.inc(endpoint=endpoint, method=request.method, status=str(response.status_code))
+    return response
+
+def query_budget(limit):
+    """Fail (strict mode) or log when the view, template included, runs more than limit SQL queries."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = view(*args, **kwargs)
+            if g.query_count > limit:
+                message = f'{request.endpoint} ran {g.query_count} SQL queries, over its budget of {limit}'
+                if current_app.config['QUERY_BUDGET_STRICT']:
+                    raise QueryBudgetExceeded(message)
+                current_app.logger.warning(message)
+            return response
+        wrapper.query_budget = limit
+        return wrapper
+    return decorator
+
+def read_only(view):
+    """Run the view's queries on the read database (DATABASE_READ_URL); writes still go to the primary."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.read_only = True
+        return view(*args, **kwargs)
+    return wrapper
+
+def page_cache_backend(config):
+    """Shared redis backend when PAGE_CACHE_REDIS_URL is set (needs the redis package), else a per-process LRU."""
+    if config['PAGE_CACHE_REDIS_URL']:
+        import redis
+        return RedisBackend(redis.Redis.from_url(config['PAGE_CACHE_REDIS_URL']))
+    return LRUBackend(config['PAGE_CACHE_SIZE'])
 
-# Initialize database
-with app.app_context():
-    db.create_all()
+def tag_page(*tags):
+    """Name the rows the cached page being rendered is built from, so that writes to them expire it."""
+    if 'page_tags' in g:
+        g.page_tags.update(tags)
+
+def invalidate_pages(*tags):
+    """Expire every cached page tagged with any of tags; call once the write is committed."""
+    current_app.extensions['page_cache'].invalidate(*tags)
+
+def cached_page(view):
+    """Serve anonymous GETs of the view from the page cache, keyed by route and query arguments.
+
+    Only complete 200 pages that did not touch the session (flashed messages,
+    CSRF tokens) are stored. The view lists its tags with tag_page().
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_app.config['PAGE_CACHE_ENABLED'] or current_user.is_authenticated or '_flashes' in session:
+            return view(*args, **kwargs)
+        cache = current_app.extensions['page_cache']
+        key = f'{request.endpoint}:{urlencode(sorted(request.view_args.items()))}?{urlencode(sorted(request.args.items(multi=True)))}'
+        cached = cache.get(key)
+        if cached is not None:
+            body, status, headers = cached
+            response = current_app.response_class(body, status, headers)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        started = time.time()
+        g.page_tags = {'all'}
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed and not session.modified:
+            response.vary.add('Cookie')
+            cache.set(key, (response.get_data(), response.status_code, list(response.headers)), g.page_tags, started)
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
 
 # Routes
-@app.route('/')
+@bp.route('/')
+@query_budget(22)
+@cached_page
+@read_only
 def index():
     search_query = request.args.get('search', '')
     tag_filter = request.args.get('tag', '')
     skill_filter = request.args.get('skill', '')
     sort_by = request.args.get('sort', 'newest')
+    cursor = request.args.get('cursor')
+    
+    # Stored recommendations first: building a missing row commits, which would expire the page's projects
+    matching_projects = []
+    matching_users = []
+    if current_user.is_authenticated:
+        matching_projects, matching_users = get_cached_recommendations(current_user.id)
     
     query = Project.query
+    keys = [(Project.created_at, True), (Project.id, True)]
     
     if search_query:
-        query = query.filter(
-            db.or_(
-                Project.title.ilike(f'%{search_query}%'),
-                Project.description.ilike(f'%{search_query}%')
-            )
+        query, score = apply_text_search(
+            query, Project, 'project_fts', search_query,
+            [Project.title, Project.description]
         )
+        # Rank by relevance unless the user picked a sort order
+        if score is not None and 'sort' not in request.args:
+            keys = [(score, False), (Project.id, False)]
     
     if tag_filter:
         query = query.filter(Project.tags.ilike(f'%{tag_filter}%'))
@@ -232,94 +1453,46 @@ def index():
     if skill_filter:
         query = query.filter(Project.required_skills.ilike(f'%{skill_filter}%'))
     
-    if sort_by == 'newest':
-        query = query.order_by(Project.created_at.desc())
-    elif sort_by == 'oldest':
-        query = query.order_by(Project.created_at.asc())
+    if sort_by == 'oldest':
+        keys = [(Project.created_at, False), (Project.id, False)]
     elif sort_by == 'active':
-        query = query.filter(Project.status == 'active').order_by(Project.created_at.desc())
+        query = query.filter(Project.status == 'active')
     elif sort_by == 'completed':
-        query = query.filter(Project.status == 'completed').order_by(Project.created_at.desc())
-    elif sort_by == 'match' and current_user.is_authenticated:
-        # Get all projects and sort by match percentage
-        projects = query.all()
-        projects = sorted(
-            projects,
-            key=lambda p: calculate_skill_match(current_user.skills, p.required_skills),
-            reverse=True
+        query = query.filter(Project.status == 'completed')
+    
+    if sort_by == 'match' and current_user.is_authenticated:
+        # Sort projects by match percentage
+        filtered = search_query or tag_filter or skill_filter
+        projects, next_cursor = paginate_by_match(
+            current_user.skills, cursor, query=query if filtered else None
         )
-        
-        # Get matching users for the current user
-        matching_users = []
-        if current_user.is_authenticated:
-            user_skills = set(skill.strip().lower() for skill in current_user.skills.split(','))
-            all_users = User.query.filter(User.id != current_user.id).all()
-            matching_users = []
-            for user in all_users:
-                user_skills2 = set(skill.strip().lower() for skill in user.skills.split(','))
-                if user_skills.intersection(user_skills2):
-                    matching_users.append(user)
-            matching_users = sorted(matching_users, key=lambda u: len(set(skill.strip().lower() for skill in u.skills.split(',')).intersection(user_skills)), reverse=True)
-        
-        return render_template('index.html',
-                            projects=projects,
-                            matching_projects=projects[:3],
-                            matching_users=matching_users[:3],
-                            search_query=search_query,
-                            tag_filter=tag_filter,
-                            skill_filter=skill_filter,
-                            sort_by=sort_by,
-                            calculate_match=calculate_skill_match)
-    
-    projects = query.all()
-    
-    # Get unique tags and skills for filter dropdowns
-    all_projects = Project.query.all()
-    unique_tags = set()
-    unique_skills = set()
-    
-    for project in all_projects:
-        if project.tags:
-            unique_tags.update(tag.strip() for tag in project.tags.split(','))
-        if project.required_skills:
-            unique_skills.update(skill.strip() for skill in project.required_skills.split(','))
-    
-    # Get matching projects and users for the current user if authenticated
-    matching_projects = []
-    matching_users = []
-    if current_user.is_authenticated:
-        # Get matching projects
-        matching_projects = sorted(
-            projects,
-            key=lambda p: calculate_skill_match(current_user.skills, p.required_skills),
-            reverse=True
-        )[:3]
-        
-        # Get matching users
-        user_skills = set(skill.strip().lower() for skill in current_user.skills.split(','))
-        all_users = User.query.filter(User.id != current_user.id).all()
-        for user in all_users:
-            user_skills2 = set(skill.strip().lower() for skill in user.skills.split(','))
-            if user_skills.intersection(user_skills2):
-                matching_users.append(user)
-        matching_users = sorted(matching_users, key=lambda u: len(set(skill.strip().lower() for skill in u.skills.split(',')).intersection(user_skills)), reverse=True)[:3]
+    else:
+        projects, next_cursor = paginate_keyset(query.options(db.joinedload(Project.creator)), keys, cursor)
+    
+    if current_user.is_authenticated and (search_query or tag_filter or skill_filter):
+        # Filtered views rank only the filtered projects
+        candidates = [row.id for row in query.order_by(None).with_entities(Project.id)]
+        ranked = rank_projects(current_user.skills, RECOMMENDATION_LIMIT, candidates, matching_only=True)
+        matching_projects = load_in_order(Project, [result.id for result in ranked], db.joinedload(Project.creator))
     
+    tag_page('projects', *(f'user:{project.creator_id}' for project in projects))
     return render_template('index.html',
                          projects=projects,
+                         next_cursor=next_cursor,
                          matching_projects=matching_projects,
                          matching_users=matching_users,
                          search_query=search_query,
                          tag_filter=tag_filter,
                          skill_filter=skill_filter,
                          sort_by=sort_by,
-                         unique_tags=sorted(unique_tags),
-                         unique_skills=sorted(unique_skills),
+                         unique_tags=get_facets('tag'),
+                         unique_skills=get_facets('skill'),
                          calculate_match=calculate_skill_match)
 
-@app.route('/register', methods=['GET', 'POST'])
+@bp.route('/register', methods=['GET', 'POST'])
 def register():
     if current_user.is_authenticated:
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     form = RegistrationForm()
     if form.validate_on_submit():
@@ -348,17 +1521,19 @@ def register():
             username=form.username.data,
             email=form.email.data,
             major=form.major.data,
-            skills=', '.join(all_skills),
+            skills=normalize_terms(', '.join(all_skills)),
             bio=form.bio.data,
             profile_image='https://i.pravatar.cc/150?img=' + str(User.query.count() % 70)
         )
         user.set_password(form.password.data)
+        set_user_skills(user)
         
         try:
             db.session.add(user)
+            invalidate_recommendations(parse_skills(user.skills))
             db.session.commit()
             flash('Registration successful! Please log in.', 'success')
-            return redirect(url_for('login'))
+            return redirect(url_for('main.login'))
         except Exception as e:
             db.session.rollback()
             flash(f'An error occurred during registration. Please try again.', 'danger')
@@ -366,10 +1541,10 @@ def register():
     
     return render_template('register.html', title='Register', form=form)
 
-@app.route('/login', methods=['GET', 'POST'])
+@bp.route('/login', methods=['GET', 'POST'])
 def login():
     if current_user.is_authenticated:
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     
     form = LoginForm()
     if form.validate_on_submit():
@@ -377,91 +1552,140 @@ def login():
         if user and user.check_password(form.password.data):
             login_user(user, remember=form.remember.data)
             next_page = request.args.get('next')
-            return redirect(next_page) if next_page else redirect(url_for('index'))
+            return redirect(next_page) if next_page else redirect(url_for('main.index'))
         flash('Invalid email or password', 'danger')
     
     return render_template('login.html', title='Login', form=form)
 
-@app.route('/logout')
+@bp.route('/logout')
 @login_required
 def logout():
     logout_user()
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
-@app.route('/create_project', methods=['GET', 'POST'])
+@bp.route('/create_project', methods=['GET', 'POST'])
 @login_required
 def create_project():
     if request.method == 'POST':
         project = Project(
             title=request.form['title'],
             description=request.form['description'],
-            tags=request.form['tags'],
-            required_skills=request.form['required_skills'],
+            tags=normalize_terms(request.form['tags']),
+            required_skills=normalize_terms(request.form['required_skills']),
             creator_id=current_user.id,
             max_collaborators=int(request.form.get('max_collaborators', 5))
         )
+        set_project_skills(project)
         db.session.add(project)
+        update_facets(set(), project_facets(project))
+        invalidate_recommendations(parse_skills(project.required_skills))
         db.session.commit()
+        invalidate_pages('projects', f'user:{current_user.id}')
         flash('Project created successfully!', 'success')
-        return redirect(url_for('index'))
+        return redirect(url_for('main.index'))
     return render_template('create_project.html')
 
-@app.route('/project/<int:project_id>')
+@bp.route('/project/<int:project_id>')
+@query_budget(10)
+@cached_page
 def project_detail(project_id):
-    project = Project.query.get_or_404(project_id)
+    project = Project.query.options(
+        db.joinedload(Project.creator),
+        db.selectinload(Project.reviews).joinedload(Review.reviewer)
+    ).filter_by(id=project_id).first_or_404()
+    tag_page(f'project:{project.id}', f'user:{project.creator_id}', *(f'user:{review.reviewer_id}' for review in project.reviews))
     return render_template('project_detail.html', project=project, calculate_match=calculate_skill_match)
 
-@app.route('/profile/<username>')
+@bp.route('/profile/<username>')
+@query_budget(8)
+@cached_page
+@read_only
 def profile(username):
     user = User.query.filter_by(username=username).first_or_404()
-    return render_template('profile.html', user=user)
+    projects = member_projects(user.id).all()
+    tag_page(f'user:{user.id}', *(f'project:{project.id}' for project in user.projects + projects))
+    return render_template('profile.html', user=user, member_projects=projects)
 
-@app.route('/profile/edit', methods=['GET', 'POST'])
+@bp.route('/profile/edit', methods=['GET', 'POST'])
 @login_required
 def edit_profile():
     if request.method == 'POST':
+        old_skills = parse_skills(current_user.skills)
         current_user.username = request.form['username']
         current_user.major = request.form['major']
-        current_user.skills = request.form['skills']
-        current_user.interests = request.form['interests']
+        current_user.skills = normalize_terms(request.form['skills'])
+        current_user.interests = normalize_terms(request.form['interests'])
         current_user.bio = request.form['bio']
         current_user.github = request.form['github']
         current_user.linkedin = request.form['linkedin']
+        set_user_skills(current_user)
+        new_skills = parse_skills(current_user.skills)
+        if new_skills != old_skills:
+            # Only the holders of added or removed skills share a different number of skills with this user
+            invalidate_recommendations(old_skills ^ new_skills, [current_user.id])
         
         db.session.commit()
+        invalidate_pages(f'user:{current_user.id}')
         flash('Profile updated successfully!', 'success')
-        return redirect(url_for('profile', username=current_user.username))
+        return redirect(url_for('main.profile', username=current_user.username))
     
     return render_template('edit_profile.html')
 
-@app.route('/messages')
+@bp.route('/messages')
+@query_budget(8)
 @login_required
 def messages():
-    received_messages = Message.query.filter_by(receiver_id=current_user.id).order_by(Message.created_at.desc()).all()
-    sent_messages = Message.query.filter_by(sender_id=current_user.id).order_by(Message.created_at.desc()).all()
+    conversations, next_cursor = paginate_keyset(
+        inbox_query(current_user.id),
+        [(Conversation.last_message_at, True), (Conversation.id, True)],
+        request.args.get('cursor')
+    )
     return render_template('messages.html', 
-                         received_messages=received_messages,
-                         sent_messages=sent_messages)
+                         conversations=conversations,
+                         next_cursor=next_cursor)
 
-@app.route('/send_message/<int:receiver_id>', methods=['GET', 'POST'])
+@bp.route('/messages/unread')
+@query_budget(4)
+@login_required
+def unread_messages():
+    senders = [{'id': sender_id, 'username': username, 'count': count}
+               for sender_id, username, count in unread_counts(current_user.id)]
+    return jsonify({
+        'total': sum(sender['count'] for sender in senders),
+        'senders': senders
+    })
+
+@bp.route('/events')
+@login_required
+def events():
+    """Server-sent event stream of new messages and collaboration requests for the current user."""
+    user_id = current_user.id
+    subscription = event_hub.subscribe(user_id)
+
+    def stream():
+        try:
+            yield from event_hub.stream(subscription, EVENT_KEEPALIVE_SECONDS)
+        finally:
+            event_hub.unsubscribe(user_id, subscription)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@bp.route('/send_message/<int:receiver_id>', methods=['GET', 'POST'])
 @login_required
 def send_message(receiver_id):
     receiver = User.query.get_or_404(receiver_id)
     
     if request.method == 'POST':
-        message = Message(
-            sender_id=current_user.id,
-            receiver_id=receiver_id,
-            content=request.form['message']
-        )
-        db.session.add(message)
+        message = deliver_message(current_user.id, receiver_id, request.form['message'])
         db.session.commit()
+        publish_message(message)
         flash('Message sent successfully!', 'success')
-        return redirect(url_for('messages'))
+        return redirect(url_for('main.messages'))
     
     return render_template('send_message.html', receiver=receiver)
 
-@app.route('/send_new_message', methods=['GET', 'POST'])
+@bp.route('/send_new_message', methods=['GET', 'POST'])
 @login_required
 def send_new_message():
     users = User.query.filter(User.id != current_user.id).all()
@@ -470,81 +1694,75 @@ def send_new_message():
         receiver_id = request.form.get('receiver_id')
         content = request.form.get('message')
         
-        message = Message(
-            sender_id=current_user.id,
-            receiver_id=receiver_id,
-            content=content
-        )
-        db.session.add(message)
+        message = deliver_message(current_user.id, receiver_id, content)
         db.session.commit()
+        publish_message(message)
         flash('Message sent successfully!', 'success')
-        return redirect(url_for('messages'))
+        return redirect(url_for('main.messages'))
     
     return render_template('send_message.html', users=users)
 
-@app.route('/user_messages/<int:user_id>', methods=['GET'])
+@bp.route('/user_messages/<int:user_id>', methods=['GET'])
+@query_budget(12)
 @login_required
 def user_messages(user_id):
     other_user = User.query.get_or_404(user_id)
+    conversation = get_conversation(current_user.id, user_id)
     
-    # Get all messages between current user and other user
-    messages = Message.query.filter(
-        ((Message.sender_id == current_user.id) & (Message.receiver_id == user_id)) |
-        ((Message.sender_id == user_id) & (Message.receiver_id == current_user.id))
-    ).order_by(Message.created_at).all()
-    
-    # Mark unread messages as read
-    unread_messages = Message.query.filter_by(
-        sender_id=user_id,
-        receiver_id=current_user.id,
-        is_read=False
-    ).all()
-    
-    for message in unread_messages:
-        message.is_read = True
-    
-    db.session.commit()
+    messages, next_cursor = [], None
+    if conversation is not None:
+        # Mark unread messages as read, before loading the page so the commit doesn't expire it
+        mark_conversation_read(conversation, current_user.id)
+        db.session.commit()
+        
+        # Newest page of the thread; older pages follow the cursor
+        messages, next_cursor = paginate_keyset(
+            Message.query.filter_by(conversation_id=conversation.id),
+            [(Message.created_at, True), (Message.id, True)],
+            request.args.get('cursor')
+        )
+        messages.reverse()
     
-    return render_template('user_messages.html', messages=messages, other_user=other_user)
+    return render_template('user_messages.html', messages=messages, other_user=other_user, next_cursor=next_cursor)
 
-@app.route('/send_direct_message/<int:receiver_id>', methods=['POST'])
+@bp.route('/send_direct_message/<int:receiver_id>', methods=['POST'])
 @login_required
 def send_direct_message(receiver_id):
     content = request.form.get('message')
     
-    message = Message(
-        sender_id=current_user.id,
-        receiver_id=receiver_id,
-        content=content
-    )
-    
-    db.session.add(message)
+    message = deliver_message(current_user.id, receiver_id, content)
     db.session.commit()
+    publish_message(message)
     
-    return redirect(url_for('user_messages', user_id=receiver_id))
+    return redirect(url_for('main.user_messages', user_id=receiver_id))
 
-@app.route('/project/<int:project_id>/join', methods=['POST'])
+@bp.route('/project/<int:project_id>/join', methods=['POST'])
 @login_required
 def join_project(project_id):
     project = Project.query.get_or_404(project_id)
     
     if project.creator_id == current_user.id:
         flash("You can't join your own project!", 'warning')
-        return redirect(url_for('project_detail', project_id=project_id))
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
-    collaborators = project.collaborators.split(',') if project.collaborators else []
-    if str(current_user.id) in collaborators:
+    if project.has_member(current_user.id):
         flash("You're already a collaborator on this project!", 'warning')
-        return redirect(url_for('project_detail', project_id=project_id))
+        return redirect(url_for('main.project_detail', project_id=project_id))
+    
+    if project.is_full():
+        flash('This project has reached its maximum number of collaborators.', 'warning')
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
-    collaborators.append(str(current_user.id))
-    project.collaborators = ','.join(collaborators)
+    project.add_member(current_user.id)
+    # One seat fewer changes the project's headroom signal
+    invalidate_recommendations(parse_skills(project.required_skills))
     db.session.commit()
+    invalidate_pages(f'project:{project_id}', f'user:{current_user.id}')
     
     flash('Successfully joined the project!', 'success')
-    return redirect(url_for('project_detail', project_id=project_id))
+    return redirect(url_for('main.project_detail', project_id=project_id))
 
-@app.route('/project/<int:project_id>/edit', methods=['GET', 'POST'])
+@bp.route('/project/<int:project_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_project(project_id):
     project = Project.query.get_or_404(project_id)
@@ -552,23 +1770,34 @@ def edit_project(project_id):
     # Check if user is the owner
     if project.creator_id != current_user.id:
         flash('You can only edit your own projects!', 'danger')
-        return redirect(url_for('project_detail', project_id=project_id))
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
     if request.method == 'POST':
+        old_skills = parse_skills(project.required_skills)
+        old_ranking = (project.status, project.max_collaborators)
+        old_facets = project_facets(project)
         project.title = request.form['title']
         project.description = request.form['description']
-        project.tags = request.form['tags']
-        project.required_skills = request.form['required_skills']
+        project.tags = normalize_terms(request.form['tags'])
+        project.required_skills = normalize_terms(request.form['required_skills'])
+        completed = completed_status_change(project.status, request.form['status'])
+        adjust_user_aggregates([project.creator_id], completed_projects=completed)
         project.status = request.form['status']
         project.max_collaborators = int(request.form.get('max_collaborators', 5))
+        set_project_skills(project)
+        update_facets(old_facets, project_facets(project))
+        new_skills = parse_skills(project.required_skills)
+        if new_skills != old_skills or (project.status, project.max_collaborators) != old_ranking:
+            invalidate_recommendations(old_skills | new_skills | (skills_of_users([project.creator_id]) if completed else set()))
         
         db.session.commit()
+        invalidate_pages('projects', f'project:{project_id}', f'user:{project.creator_id}')
         flash('Project updated successfully!', 'success')
-        return redirect(url_for('project_detail', project_id=project_id))
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
     return render_template('edit_project.html', project=project)
 
-@app.route('/project/<int:project_id>/delete', methods=['POST'])
+@bp.route('/project/<int:project_id>/delete', methods=['POST'])
 @login_required
 def delete_project(project_id):
     project = Project.query.get_or_404(project_id)
@@ -576,28 +1805,31 @@ def delete_project(project_id):
     # Check if user is the owner
     if project.creator_id != current_user.id:
         flash('You can only delete your own projects!', 'danger')
-        return redirect(url_for('project_detail', project_id=project_id))
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
     db.session.delete(project)
+    update_facets(project_facets(project), set())
+    adjust_user_aggregates([project.creator_id], completed_projects=completed_status_change(project.status, None))
+    invalidate_recommendations(parse_skills(project.required_skills))
     db.session.commit()
+    invalidate_pages('projects', f'project:{project_id}', f'user:{current_user.id}')
     flash('Project deleted successfully!', 'success')
-    return redirect(url_for('index'))
+    return redirect(url_for('main.index'))
 
-@app.route('/project/<int:project_id>/collaborators')
+@bp.route('/project/<int:project_id>/collaborators')
 @login_required
 def project_collaborators(project_id):
     project = Project.query.get_or_404(project_id)
-    collaborators = []
-    
-    if project.collaborators:
-        collaborator_ids = project.collaborators.split(',')
-        collaborators = User.query.filter(User.id.in_(collaborator_ids)).all()
+    collaborators = User.query.join(ProjectMember, ProjectMember.user_id == User.id).filter(
+        ProjectMember.project_id == project_id
+    ).order_by(ProjectMember.joined_at).all()
     
     return render_template('project_collaborators.html', 
                          project=project,
                          collaborators=collaborators)
 
-@app.route('/academic_projects')
+@bp.route('/academic_projects')
+@cached_page
 def academic_projects():
     project_type = request.args.get('type', 'all')
     department = request.args.get('department', 'all')
@@ -609,17 +1841,21 @@ def academic_projects():
     if department != 'all':
         query = query.filter_by(department=department)
         
-    projects = query.order_by(AcademicProject.created_at.desc()).all()
+    projects, next_cursor = paginate_keyset(
+        query, [(AcademicProject.created_at, True), (AcademicProject.id, True)], request.args.get('cursor')
+    )
     departments = db.session.query(AcademicProject.department).distinct().all()
     departments = [d[0] for d in departments]
     
+    tag_page('academic_projects')
     return render_template('academic_projects.html', 
                          projects=projects, 
+                         next_cursor=next_cursor,
                          departments=departments,
                          selected_type=project_type,
                          selected_dept=department)
 
-@app.route('/academic_project/new', methods=['GET', 'POST'])
+@bp.route('/academic_project/new', methods=['GET', 'POST'])
 @login_required
 def new_academic_project():
     if request.method == 'POST':
@@ -648,25 +1884,26 @@ def new_academic_project():
         
         db.session.add(project)
         db.session.commit()
+        invalidate_pages('academic_projects')
         
         flash('Your academic project has been created!', 'success')
-        return redirect(url_for('academic_projects'))
+        return redirect(url_for('main.academic_projects'))
     
     return render_template('new_academic_project.html')
 
-@app.route('/academic_project/<int:project_id>')
+@bp.route('/academic_project/<int:project_id>')
 def academic_project_detail(project_id):
     project = AcademicProject.query.get_or_404(project_id)
     return render_template('academic_project_detail.html', project=project)
 
-@app.route('/academic_project/<int:project_id>/edit', methods=['GET', 'POST'])
+@bp.route('/academic_project/<int:project_id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit_academic_project(project_id):
     project = AcademicProject.query.get_or_404(project_id)
     
     if project.user_id != current_user.id:
         flash('You can only edit your own projects!', 'danger')
-        return redirect(url_for('academic_projects'))
+        return redirect(url_for('main.academic_projects'))
     
     if request.method == 'POST':
         project.title = request.form.get('title')
@@ -680,12 +1917,13 @@ def edit_academic_project(project_id):
         project.status = request.form.get('status')
         
         db.session.commit()
+        invalidate_pages('academic_projects')
         flash('Your academic project has been updated!', 'success')
-        return redirect(url_for('academic_project_detail', project_id=project.id))
+        return redirect(url_for('main.academic_project_detail', project_id=project.id))
     
     return render_template('edit_academic_project.html', project=project)
 
-@app.route('/project/<int:project_id>/collaborate', methods=['POST'])
+@bp.route('/project/<int:project_id>/collaborate', methods=['POST'])
 @login_required
 def request_collaboration(project_id):
     project = Project.query.get_or_404(project_id)
@@ -699,14 +1937,12 @@ def request_collaboration(project_id):
     
     if existing_request:
         flash('You already have a pending request for this project.', 'warning')
-        return redirect(url_for('project_detail', project_id=project_id))
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
     # Check if project is full
-    if project.collaborators:
-        current_collaborators = len(project.collaborators.split(','))
-        if current_collaborators >= project.max_collaborators:
-            flash('This project has reached its maximum number of collaborators.', 'warning')
-            return redirect(url_for('project_detail', project_id=project_id))
+    if project.is_full():
+        flash('This project has reached its maximum number of collaborators.', 'warning')
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
     message = request.form.get('message', '')
     collab_request = CollaborationRequest(
@@ -719,29 +1955,38 @@ def request_collaboration(project_id):
     db.session.commit()
     
     # Send notification to project owner
+    publish_collaboration_request(collab_request, project.creator_id)
     flash('Your collaboration request has been sent!', 'success')
-    return redirect(url_for('project_detail', project_id=project_id))
+    return redirect(url_for('main.project_detail', project_id=project_id))
 
-@app.route('/collaboration-requests')
+@bp.route('/collaboration-requests')
+@query_budget(8)
 @login_required
 def collaboration_requests():
+    keys = [(CollaborationRequest.created_at, True), (CollaborationRequest.id, True)]
+    eager = [db.joinedload(CollaborationRequest.sender),
+             db.joinedload(CollaborationRequest.project).joinedload(Project.creator)]
+    
     # Get requests for user's projects
-    owned_projects = Project.query.filter_by(creator_id=current_user.id).all()
-    project_ids = [p.id for p in owned_projects]
-    received_requests = CollaborationRequest.query.filter(
-        CollaborationRequest.project_id.in_(project_ids)
-    ).order_by(CollaborationRequest.created_at.desc()).all()
+    owned_project_ids = db.select(Project.id).where(Project.creator_id == current_user.id)
+    received_requests, received_cursor = paginate_keyset(
+        CollaborationRequest.query.options(*eager).filter(CollaborationRequest.project_id.in_(owned_project_ids)),
+        keys, request.args.get('received_cursor')
+    )
     
     # Get requests sent by user
-    sent_requests = CollaborationRequest.query.filter_by(
-        sender_id=current_user.id
-    ).order_by(CollaborationRequest.created_at.desc()).all()
+    sent_requests, sent_cursor = paginate_keyset(
+        CollaborationRequest.query.options(*eager).filter_by(sender_id=current_user.id),
+        keys, request.args.get('sent_cursor')
+    )
     
     return render_template('collaboration_requests.html',
                          received_requests=received_requests,
-                         sent_requests=sent_requests)
+                         sent_requests=sent_requests,
+                         received_cursor=received_cursor,
+                         sent_cursor=sent_cursor)
 
-@app.route('/collaboration-request/<int:request_id>/<action>')
+@bp.route('/collaboration-request/<int:request_id>/<action>')
 @login_required
 def handle_collaboration_request(request_id, action):
     collab_request = CollaborationRequest.query.get_or_404(request_id)
@@ -750,14 +1995,21 @@ def handle_collaboration_request(request_id, action):
     # Verify the current user owns the project
     if project.creator_id != current_user.id:
         flash('You are not authorized to handle this request.', 'danger')
-        return redirect(url_for('collaboration_requests'))
-    
+        return redirect(url_for('main.collaboration_requests'))
+
+    if collab_request.status != 'pending':
+        flash('This request has already been handled.', 'info')
+        return redirect(url_for('main.collaboration_requests'))
+
+    if action == 'accept' and project.is_full():
+        flash('This project has reached its maximum number of collaborators.', 'warning')
+        return redirect(url_for('main.collaboration_requests'))
+
     if action == 'accept':
         # Add collaborator to project
-        current_collaborators = project.collaborators.split(',') if project.collaborators else []
-        current_collaborators.append(str(collab_request.sender_id))
-        project.collaborators = ','.join(filter(None, current_collaborators))
+        project.add_member(collab_request.sender_id)
         collab_request.status = 'accepted'
+        invalidate_recommendations(parse_skills(project.required_skills))
         flash('Collaboration request accepted!', 'success')
         
     elif action == 'reject':
@@ -765,9 +2017,14 @@ def handle_collaboration_request(request_id, action):
         flash('Collaboration request rejected.', 'info')
     
     db.session.commit()
-    return redirect(url_for('collaboration_requests'))
+    if action == 'accept':
+        invalidate_pages(f'project:{project.id}', f'user:{collab_request.sender_id}')
+    publish_collaboration_request(collab_request, collab_request.sender_id)
+    return redirect(url_for('main.collaboration_requests'))
 
-@app.route('/search')
+@bp.route('/search')
+@query_budget(10)
+@read_only
 def search():
     query = request.args.get('q', '')
     major = request.args.get('major', '')
@@ -777,156 +2034,617 @@ def search():
         'users': [],
         'projects': []
     }
+    next_cursor = {
+        'users': None,
+        'projects': None
+    }
     
     if search_type in ['all', 'users']:
         # Search users by skills and major
         user_query = User.query
+        keys = [(User.id, True)]
         if query:
-            user_query = user_query.filter(
-                User.skills.ilike(f'%{query}%') |
-                User.username.ilike(f'%{query}%') |
-                User.bio.ilike(f'%{query}%')
+            user_query, score = apply_text_search(
+                user_query, User, 'user_fts', query,
+                [User.skills, User.username, User.bio]
             )
+            if score is not None:
+                keys = [(score, False), (User.id, False)]
         if major:
             user_query = user_query.filter(User.major == major)
-        results['users'] = user_query.all()
+        results['users'], next_cursor['users'] = paginate_keyset(
+            user_query, keys, request.args.get('users_cursor')
+        )
     
     if search_type in ['all', 'projects']:
         # Search projects by required skills and title
-        project_query = Project.query
+        project_query = Project.query.options(db.joinedload(Project.creator))
+        keys = [(Project.created_at, True), (Project.id, True)]
         if query:
-            project_query = project_query.filter(
-                Project.required_skills.ilike(f'%{query}%') |
-                Project.title.ilike(f'%{query}%') |
-                Project.description.ilike(f'%{query}%')
+            project_query, score = apply_text_search(
+                project_query, Project, 'project_fts', query,
+                [Project.required_skills, Project.title, Project.description]
             )
+            if score is not None:
+                keys = [(score, False), (Project.id, False)]
         if major:
-            project_query = project_query.join(User).filter(User.major == major)
-        results['projects'] = project_query.all()
+            project_query = project_query.join(User, Project.creator_id == User.id).filter(User.major == major)
+        results['projects'], next_cursor['projects'] = paginate_keyset(
+            project_query, keys, request.args.get('projects_cursor')
+        )
     
     # If it's an API request, return JSON
     if request.args.get('format') == 'json':
         return jsonify({
-            'users': [{
-                'id': user.id,
-                'username': user.username,
-                'major': user.major,
-                'skills': user.skills,
-                'bio': user.bio,
-                'profile_image': user.profile_image
-            } for user in results['users']],
-            'projects': [{
-                'id': project.id,
-                'title': project.title,
-                'description': project.description,
-                'required_skills': project.required_skills,
-                'creator': {
-                    'id': project.creator.id,
-                    'username': project.creator.username
-                }
-            } for project in results['projects']]
+            'users': [serialize_user(user) for user in results['users']],
+            'projects': [serialize_project(project) for project in results['projects']],
+            'next_cursor': next_cursor
         })
     
     return render_template('search.html', 
                          results=results,
+                         next_cursor=next_cursor,
                          query=query,
                          major=major,
                          search_type=search_type)
 
-@app.route('/project/<int:project_id>/complete', methods=['POST'])
+@bp.route('/project/<int:project_id>/complete', methods=['POST'])
 @login_required
 def complete_project(project_id):
     project = Project.query.get_or_404(project_id)
     if project.creator_id != current_user.id:
         flash('You are not authorized to complete this project.', 'danger')
-        return redirect(url_for('project_detail', project_id=project_id))
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
+    completed = completed_status_change(project.status, 'completed')
+    adjust_user_aggregates([project.creator_id], completed_projects=completed)
     project.status = 'completed'
-    current_user.update_experience_points()
+    # The status signal changes, and so does the creator's experience when the project was not completed yet
+    invalidate_recommendations(parse_skills(project.required_skills) | (skills_of_users([project.creator_id]) if completed else set()))
     db.session.commit()
+    invalidate_pages('projects', f'project:{project_id}', f'user:{project.creator_id}')
     flash('Project marked as completed!', 'success')
-    return redirect(url_for('project_detail', project_id=project_id))
+    return redirect(url_for('main.project_detail', project_id=project_id))
 
-@app.route('/project/<int:project_id>/review', methods=['POST'])
+@bp.route('/project/<int:project_id>/review', methods=['POST'])
+@query_budget(8)
 @login_required
 def add_review(project_id):
     project = Project.query.get_or_404(project_id)
     if project.status != 'completed':
         flash('You can only review completed projects.', 'danger')
-        return redirect(url_for('project_detail', project_id=project_id))
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
     rating = float(request.form.get('rating'))
     comment = request.form.get('comment')
     feedback_tags = request.form.get('feedback_tags', '')
     
-    # Create review for each team member
-    collaborators = project.collaborators.split(',') if project.collaborators else []
-    for collaborator_id in collaborators:
-        if collaborator_id and int(collaborator_id) != current_user.id:  # Don't review yourself
-            review = Review(
-                reviewer_id=current_user.id,
-                reviewee_id=int(collaborator_id),
-                project_id=project_id,
-                rating=rating,
-                comment=comment,
-                feedback_tags=feedback_tags
-            )
-            db.session.add(review)
-            user = User.query.get(int(collaborator_id))
-            user.update_experience_points()
-            user.update_average_rating()
+    # Review every team member except yourself, in one insert and one aggregate update
+    reviewee_ids = [user_id for (user_id,) in db.session.query(ProjectMember.user_id).filter(
+        ProjectMember.project_id == project_id, ProjectMember.user_id != current_user.id
+    )]
+    try:
+        if reviewee_ids:
+            db.session.execute(db.insert(Review), [{
+                'reviewer_id': current_user.id,
+                'reviewee_id': reviewee_id,
+                'project_id': project_id,
+                'rating': rating,
+                'comment': comment,
+                'feedback_tags': feedback_tags
+            } for reviewee_id in reviewee_ids])
+            adjust_user_aggregates(reviewee_ids, rating_sum=rating, rating_count=1,
+                                   positive_reviews=int(rating >= POSITIVE_RATING))
+            # The reviewees' rating and experience signals changed for everyone they may be recommended to
+            invalidate_recommendations(skills_of_users(reviewee_ids))
+        db.session.commit()
+    except Exception:
+        current_app.logger.exception('Could not submit reviews for project %s', project_id)
+        db.session.rollback()
+        flash('Reviews could not be submitted, please try again.', 'danger')
+        return redirect(url_for('main.project_detail', project_id=project_id))
     
-    db.session.commit()
+    invalidate_pages(f'project:{project_id}', *(f'user:{reviewee_id}' for reviewee_id in reviewee_ids))
     flash('Reviews submitted successfully!', 'success')
-    return redirect(url_for('project_detail', project_id=project_id))
+    return redirect(url_for('main.project_detail', project_id=project_id))
+
+@bp.route('/facets')
+@query_budget(4)
+def facets():
+    return jsonify({
+        'tags': [{'value': value, 'count': count} for value, count in get_facets('tag')],
+        'skills': [{'value': value, 'count': count} for value, count in get_facets('skill')]
+    })
+
+@bp.route('/metrics')
+def prometheus_metrics():
+    """Request, SQL and template timings of this worker in the Prometheus text format"""
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
 
-@app.route('/recommendations')
+@bp.route('/cache/stats')
+def cache_stats():
+    """Page cache counters for this worker, to size PAGE_CACHE_SIZE by hit rate"""
+    return jsonify(dict(current_app.extensions['page_cache'].stats(), max_entries=current_app.config['PAGE_CACHE_SIZE']))
+
+@bp.route('/recommendations')
+@query_budget(16)
 @login_required
 def get_recommendations():
     if not current_user.is_authenticated:
         return jsonify({'error': 'Not authenticated'}), 401
     
-    user_skills = set(skill.strip().lower() for skill in current_user.skills.split(','))
-    
-    # Find matching projects
-    matching_projects = []
-    for project in Project.query.filter(Project.status == 'active').all():
-        project_skills = set(skill.strip().lower() for skill in project.required_skills.split(','))
-        if user_skills.intersection(project_skills):
-            matching_projects.append(project)
-    
-    # Find matching users
-    matching_users = []
-    for user in User.query.filter(User.id != current_user.id).all():
-        user_skills2 = set(skill.strip().lower() for skill in user.skills.split(','))
-        if user_skills.intersection(user_skills2):
-            matching_users.append(user)
+    # Look up the stored matches for this user
+    matching_projects, matching_users = get_cached_recommendations(current_user.id)
     
     # If it's an API request, return JSON
     if request.args.get('format') == 'json':
-        return jsonify({
-            'projects': [{
-                'id': project.id,
-                'title': project.title,
-                'description': project.description,
-                'required_skills': project.required_skills,
-                'creator': {
-                    'id': project.creator.id,
-                    'username': project.creator.username
-                }
-            } for project in matching_projects[:3]],  # Limit to 3 projects
-            'users': [{
-                'id': user.id,
-                'username': user.username,
-                'major': user.major,
-                'skills': user.skills,
-                'bio': user.bio
-            } for user in matching_users[:3]]  # Limit to 3 users
-        })
+        return jsonify(serialize_recommendations(current_user, matching_projects, matching_users))
     
     return render_template('recommendations.html',
-                         matching_projects=matching_projects[:3],
-                         matching_users=matching_users[:3])
+                         matching_projects=matching_projects,
+                         matching_users=matching_users)
+
+# JSON API, version 1
+@api.errorhandler(400)
+@api.errorhandler(401)
+@api.errorhandler(403)
+@api.errorhandler(404)
+def api_error(error):
+    return jsonify({'error': error.description}), error.code
+
+@api.route('/projects')
+@query_budget(4)
+@read_only
+def api_projects():
+    project_query = Project.query
+    if request.args.get('status'):
+        project_query = project_query.filter(Project.status == request.args['status'])
+    version = [rows_version(project_query, Project.updated_at), rows_version(User.query, User.updated_at)]
+
+    def build():
+        projects, next_cursor = paginate_keyset(
+            project_query.options(db.joinedload(Project.creator)),
+            [(Project.created_at, True), (Project.id, True)],
+            request.args.get('cursor')
+        )
+        return {'projects': [serialize_project(project) for project in projects], 'next_cursor': next_cursor}
+    return conditional_json(version, build)
+
+@api.route('/projects/<int:project_id>')
+@query_budget(4)
+@read_only
+def api_project(project_id):
+    project = Project.query.options(db.joinedload(Project.creator)).filter_by(id=project_id).first_or_404()
+    members = ProjectMember.query.filter_by(project_id=project_id)
+    version = [project.id, isoformat(project.updated_at), isoformat(project.creator.updated_at),
+               rows_version(members, ProjectMember.joined_at)]
+
+    def build():
+        return dict(serialize_project(project), members=[
+            dict(serialize_user_summary(member.user), role=member.role, joined_at=isoformat(member.joined_at))
+            for member in members.options(db.joinedload(ProjectMember.user)).order_by(ProjectMember.joined_at)
+        ])
+    return conditional_json(version, build)
+
+@api.route('/users/<username>')
+@query_budget(2)
+@read_only
+def api_user(username):
+    user = User.query.filter_by(username=username).first_or_404()
+    return conditional_json([user.id, isoformat(user.updated_at)], lambda: serialize_user(user))
+
+@api.route('/search')
+@query_budget(6)
+@read_only
+def api_search():
+    query = request.args.get('q', '')
+    search_type = request.args.get('type', 'all')
+    version = [rows_version(Project.query, Project.updated_at), rows_version(User.query, User.updated_at)]
+
+    def build():
+        results = {}
+        if search_type in ['all', 'users']:
+            user_query, keys = User.query, [(User.id, True)]
+            if query:
+                user_query, score = apply_text_search(user_query, User, 'user_fts', query,
+                                                      [User.skills, User.username, User.bio])
+                if score is not None:
+                    keys = [(score, False), (User.id, False)]
+            users, cursor = paginate_keyset(user_query, keys, request.args.get('users_cursor'))
+            results.update(users=[serialize_user(user) for user in users], users_cursor=cursor)
+        if search_type in ['all', 'projects']:
+            project_query = Project.query.options(db.joinedload(Project.creator))
+            keys = [(Project.created_at, True), (Project.id, True)]
+            if query:
+                project_query, score = apply_text_search(project_query, Project, 'project_fts', query,
+                                                         [Project.required_skills, Project.title, Project.description])
+                if score is not None:
+                    keys = [(score, False), (Project.id, False)]
+            projects, cursor = paginate_keyset(project_query, keys, request.args.get('projects_cursor'))
+            results.update(projects=[serialize_project(project) for project in projects], projects_cursor=cursor)
+        return results
+    return conditional_json(version, build)
+
+@api.route('/recommendations')
+@query_budget(18)
+@login_required
+def api_recommendations():
+    cache = recommendation_cache(current_user.id)
+    version = [isoformat(cache.updated_at), cache.project_ids, cache.user_ids,
+               rows_version(Project.query, Project.updated_at), rows_version(User.query, User.updated_at)]
+
+    def build():
+        return serialize_recommendations(current_user, *get_cached_recommendations(current_user.id))
+    return conditional_json(version, build)
+
+@api.route('/messages')
+@query_budget(4)
+@login_required
+def api_conversations():
+    user_id = current_user.id
+    mine = db.or_(Conversation.user_low_id == user_id, Conversation.user_high_id == user_id)
+    unread = db.case((Conversation.user_low_id == user_id, Conversation.low_unread), else_=Conversation.high_unread)
+    version = list(db.session.query(
+        db.func.count(Conversation.id), db.func.max(Conversation.last_message_id), db.func.sum(unread)
+    ).filter(mine).one())
+
+    def build():
+        conversations, next_cursor = paginate_keyset(
+            inbox_query(user_id),
+            [(Conversation.last_message_at, True), (Conversation.id, True)],
+            request.args.get('cursor')
+        )
+        return {'conversations': [serialize_conversation(conversation, user_id) for conversation in conversations],
+                'next_cursor': next_cursor}
+    return conditional_json(version, build)
+
+@api.route('/messages/<int:user_id>')
+@query_budget(4)
+@login_required
+def api_thread(user_id):
+    conversation = get_conversation(current_user.id, user_id)
+    if conversation is None:
+        User.query.get_or_404(user_id)
+        return conditional_json(None, lambda: {'messages': [], 'next_cursor': None})
+    version = [conversation.id, conversation.last_message_id, conversation.low_unread, conversation.high_unread]
+
+    def build():
+        # Newest first; unlike the thread page this does not mark anything read
+        messages, next_cursor = paginate_keyset(
+            Message.query.filter_by(conversation_id=conversation.id),
+            [(Message.created_at, True), (Message.id, True)],
+            request.args.get('cursor')
+        )
+        return {'messages': [serialize_message(message) for message in messages], 'next_cursor': next_cursor}
+    return conditional_json(version, build)
+
+@api.route('/collaboration-requests')
+@query_budget(6)
+@login_required
+def api_collaboration_requests():
+    owned_project_ids = db.select(Project.id).where(Project.creator_id == current_user.id)
+    received = CollaborationRequest.query.filter(CollaborationRequest.project_id.in_(owned_project_ids))
+    sent = CollaborationRequest.query.filter_by(sender_id=current_user.id)
+    version = [rows_version(received, CollaborationRequest.updated_at), rows_version(sent, CollaborationRequest.updated_at)]
+
+    def build():
+        keys = [(CollaborationRequest.created_at, True), (CollaborationRequest.id, True)]
+        eager = [db.joinedload(CollaborationRequest.sender), db.joinedload(CollaborationRequest.project)]
+        received_requests, received_cursor = paginate_keyset(received.options(*eager), keys, request.args.get('received_cursor'))
+        sent_requests, sent_cursor = paginate_keyset(sent.options(*eager), keys, request.args.get('sent_cursor'))
+        return {
+            'received': [serialize_collaboration_request(item) for item in received_requests],
+            'sent': [serialize_collaboration_request(item) for item in sent_requests],
+            'received_cursor': received_cursor,
+            'sent_cursor': sent_cursor
+        }
+    return conditional_json(version, build)
+
+@api.route('/autocomplete')
+@query_budget(2)
+def api_autocomplete():
+    """Canonical skills or project tags completing q, most used first"""
+    kind = request.args.get('kind', 'skill')
+    if kind not in autocomplete_indexes:
+        abort(400, "kind must be 'skill' or 'tag'")
+    query = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 8, type=int), 1), 10)
+    suggestions = get_autocomplete_index(kind).complete(query, limit)
+    response = jsonify({'kind': kind, 'query': query,
+                        'suggestions': [{'value': value, 'count': count} for value, count in suggestions]})
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response
+
+# Exported tables, the column updated_since is compared with, and columns left out
+EXPORTS = {
+    'projects': (Project, 'updated_at', ()),
+    'users': (User, 'updated_at', ('password_hash',)),
+    'reviews': (Review, 'created_at', ()),
+    'messages': (Message, 'created_at', ())
+}
+
+def parse_updated_since(value):
+    """An ISO 8601 timestamp as the naive UTC datetime the tables store; raises ValueError."""
+    since = datetime.fromisoformat(value)
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+def export_lines(kind, updated_since=None, batch_size=1000):
+    """Yield one JSON line per row of an exported table, in id order.
+
+    Rows are fetched yield_per batch_size through a server-side cursor, so the
+    table is never loaded whole. With updated_since, only rows changed at or
+    after it are included.
+    """
+    model, updated_column, excluded = EXPORTS[kind]
+    columns = [column for column in model.__table__.columns if column.key not in excluded]
+    query = db.select(*columns).order_by(model.id)
+    if updated_since is not None:
+        query = query.where(getattr(model, updated_column) >= updated_since)
+    for row in db.session.execute(query.execution_options(yield_per=batch_size)):
+        yield json.dumps({key: isoformat(value) if hasattr(value, 'isoformat') else value
+                          for key, value in row._mapping.items()}) + '\n'
+
+def gzip_chunks(lines, chunk_size=64 * 1024):
+    """Gzip-compress a stream of text lines, yielding compressed chunks of about chunk_size input bytes."""
+    compressor = zlib.compressobj(wbits=31)
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line.encode())
+        size += len(buffer[-1])
+        if size >= chunk_size:
+            yield compressor.compress(b''.join(buffer))
+            buffer, size = [], 0
+    yield compressor.compress(b''.join(buffer)) + compressor.flush()
+
+@api.route('/export/<kind>')
+@read_only
+def api_export(kind):
+    """Stream a whole table as NDJSON, gzip-compressed when the client accepts it"""
+    token = current_app.config['EXPORT_TOKEN']
+    if not token or kind not in EXPORTS:
+        abort(404, 'Not found')
+    if not secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        abort(403, 'A valid export token is required')
+    updated_since = None
+    if request.args.get('updated_since'):
+        try:
+            updated_since = parse_updated_since(request.args['updated_since'])
+        except ValueError:
+            abort(400, 'updated_since must be an ISO 8601 timestamp')
+
+    lines = export_lines(kind, updated_since, current_app.config['EXPORT_BATCH_SIZE'])
+    headers = {'Cache-Control': 'no-store', 'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.accept_encodings:
+        lines = gzip_chunks(lines)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson', headers=headers)
+
+def add_skill_alias(alias, canonical):
+    """Save alias as canonical from now on, and rewrite the users and projects that already use it.
+
+    Returns the number of users and projects looked at for rewriting.
+    """
+    key = normalize(alias)
+    canonical = ' '.join(canonical.split())
+    # Point at the end of an existing alias chain, never at another alias
+    canonical = alias_map([canonical]).get(normalize(canonical), canonical)
+    if not key or key == normalize(canonical):
+        raise ValueError('An alias must differ from its canonical name')
+    db.session.merge(SkillAlias(alias=key, canonical=canonical))
+    SkillAlias.query.filter(db.func.lower(SkillAlias.canonical) == key).update(
+        {SkillAlias.canonical: canonical}, synchronize_session=False
+    )
+    db.session.flush()
+
+    user_ids = users_with_skills({key}) | {user_id for (user_id,) in db.session.query(User.id).filter(User.interests.ilike(f'%{key}%'))}
+    users = User.query.filter(User.id.in_(user_ids)).all() if user_ids else []
+    for user in users:
+        user.skills = normalize_terms(user.skills)
+        user.interests = normalize_terms(user.interests)
+        set_user_skills(user)
+    projects = Project.query.filter(db.or_(
+        Project.id.in_(db.select(ProjectSkill.project_id).join(Skill).where(Skill.name == key)),
+        Project.tags.ilike(f'%{key}%')
+    )).all()
+    for project in projects:
+        old_facets = project_facets(project)
+        project.required_skills = normalize_terms(project.required_skills)
+        project.tags = normalize_terms(project.tags)
+        set_project_skills(project)
+        update_facets(old_facets, project_facets(project))
+    invalidate_recommendations({key, canonical.lower()}, user_ids)
+    db.session.commit()
+    invalidate_pages('all')
+    return len(users), len(projects)
+
+def insert_rows(model, rows, batch_size=5000):
+    """Bulk-insert plain dict rows in executemany batches."""
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(db.insert(model), rows[start:start + batch_size])
+
+def insert_skill_links(model, owner_column, owners):
+    """Bulk-insert skill index rows for (owner id, skills string) pairs, resolving the names in one pass."""
+    spellings = skill_spellings(*(skills for _, skills in owners))
+    owners = [(owner_id, parse_skills(skills)) for owner_id, skills in owners]
+    skills = get_or_create_skills(set().union(*(names for _, names in owners)), spellings)
+    db.session.flush()
+    skill_ids = {skill.name: skill.id for skill in skills}
+    insert_rows(model, [{owner_column: owner_id, 'skill_id': skill_ids[name]} for owner_id, names in owners for name in names])
+    autocomplete_indexes['skill'].version = None
+    if model is UserSkill:
+        mark_people_index_stale()
+
+def load_synthetic_data(users, projects, messages=0, reviews=0, seed=42, password='password123'):
+    """Bulk-load a seeded synthetic data set, then rebuild the skill index, facets and user aggregates.
+
+    Every synthetic user logs in as user<id>@example.edu with the same password.
+    Returns the generated rows.
+    """
+    offsets = {name: db.session.query(db.func.max(model.id)).scalar() or 0 for name, model in [
+        ('users', User), ('projects', Project), ('conversations', Conversation), ('messages', Message), ('reviews', Review)
+    ]}
+    data = synthetic.generate(users, projects, messages, reviews, seed=seed, id_offsets=offsets)
+    # Hashing is deliberately slow, so all synthetic users share one hash
+    password_hash = generate_password_hash(password)
+    for row in data['users']:
+        row['password_hash'] = password_hash
+
+    insert_rows(User, data['users'])
+    insert_rows(Project, data['projects'])
+    insert_rows(ProjectMember, data['members'])
+    insert_rows(Conversation, data['conversations'])
+    insert_rows(Message, data['messages'])
+    insert_rows(Review, data['reviews'])
+
+    insert_skill_links(UserSkill, 'user_id', [(row['id'], row['skills']) for row in data['users']])
+    insert_skill_links(ProjectSkill, 'project_id', [(row['id'], row['required_skills']) for row in data['projects']])
+    RecommendationCache.query.delete()
+    db.session.commit()
+
+    rebuild_facets()
+    verify_user_aggregates(fix=True)
+    invalidate_pages('all')
+    return data
+
+def resolve_creators(entries, column):
+    """Replace the creator (username or email) of validated rows with a user id in column, rejecting unknown users."""
+    keys = {clean['creator'] for _, _, clean in entries}
+    users = {}
+    for user_id, username, email in db.session.query(User.id, User.username, User.email).filter(
+        db.or_(User.username.in_(keys), User.email.in_(keys))
+    ):
+        users[username] = users[email] = user_id
+    accepted, rejects = [], []
+    for line, raw, clean in entries:
+        creator = clean.pop('creator')
+        if creator in users:
+            accepted.append((line, raw, dict(clean, **{column: users[creator]})))
+        else:
+            rejects.append((line, raw, f'creator {creator} is not a user'))
+    return accepted, rejects
+
+def normalize_columns(rows, columns):
+    """normalize_terms() the given skills or tags columns of a batch of rows, with one alias lookup."""
+    aliases = alias_map(row[column] for row in rows for column in columns)
+    for row in rows:
+        for column in columns:
+            row[column] = normalize_terms(row[column], aliases)
+
+def write_users(entries, password_hashes):
+    """Insert one batch of validated users, skipping emails and usernames already taken."""
+    emails = [clean['email'] for _, _, clean in entries]
+    usernames = [clean['username'] for _, _, clean in entries]
+    taken_emails = {email for (email,) in db.session.query(User.email).filter(User.email.in_(emails))}
+    taken_usernames = {name for (name,) in db.session.query(User.username).filter(User.username.in_(usernames))}
+    rows, rejects = [], []
+    for (line, raw, clean), password_hash in zip(entries, password_hashes):
+        if clean['email'] in taken_emails:
+            rejects.append((line, raw, f"email {clean['email']} is already registered"))
+        elif clean['username'] in taken_usernames:
+            rejects.append((line, raw, f"username {clean['username']} is already taken"))
+        else:
+            taken_emails.add(clean['email'])
+            taken_usernames.add(clean['username'])
+            row = dict(clean, password_hash=password_hash)
+            del row['password']
+            if not row['profile_image']:
+                row['profile_image'] = f"https://i.pravatar.cc/150?img={int(hashlib.sha1(row['email'].encode()).hexdigest(), 16) % 70}"
+            rows.append(row)
+    normalize_columns(rows, ['skills', 'interests'])
+    if rows:
+        ids = db.session.execute(db.insert(User).returning(User.id, sort_by_parameter_order=True), rows).scalars().all()
+        insert_skill_links(UserSkill, 'user_id', [(user_id, row['skills']) for user_id, row in zip(ids, rows)])
+    return len(rows), rejects
+
+def write_projects(entries, password_hashes=None):
+    """Insert one batch of validated projects with their skill index rows and completed counts.
+
+    As with projects created in the app, the creator is not added as a member.
+    """
+    entries, rejects = resolve_creators(entries, 'creator_id')
+    rows = [clean for _, _, clean in entries]
+    normalize_columns(rows, ['required_skills', 'tags'])
+    if rows:
+        ids = db.session.execute(db.insert(Project).returning(Project.id, sort_by_parameter_order=True), rows).scalars().all()
+        insert_skill_links(ProjectSkill, 'project_id', [(project_id, row['required_skills']) for project_id, row in zip(ids, rows)])
+        completed = {}
+        for row in rows:
+            if row['status'] == 'completed':
+                completed[row['creator_id']] = completed.get(row['creator_id'], 0) + 1
+        for count in set(completed.values()):
+            adjust_user_aggregates([user_id for user_id, n in completed.items() if n == count], completed_projects=count)
+    return len(rows), rejects
+
+def write_academic_projects(entries, password_hashes=None):
+    """Insert one batch of validated academic projects."""
+    entries, rejects = resolve_creators(entries, 'user_id')
+    insert_rows(AcademicProject, [clean for _, _, clean in entries])
+    return len(entries), rejects
+
+IMPORT_WRITERS = {
+    'users': write_users,
+    'projects': write_projects,
+    'academic-projects': write_academic_projects
+}
+
+def import_records(kind, records, batch_size=1000, workers=None, on_reject=None, on_progress=None):
+    """Validate and insert streamed (line number, row) records of one kind, committing each batch.
+
+    Passwords are hashed in a process pool while the previous batch is being
+    written. on_reject(line, row, reason) is called for every rejected row and
+    on_progress(read, imported, rejected) after every batch. Returns
+    (imported, rejected).
+    """
+    validate, write = importer.VALIDATORS[kind], IMPORT_WRITERS[kind]
+    on_reject = on_reject or (lambda line, row, reason: None)
+    read = imported = rejected = 0
+    pool = ProcessPoolExecutor(workers) if kind == 'users' else None
+    pending = None
+
+    def flush(entries, password_hashes):
+        nonlocal imported, rejected
+        count, rejects = write(entries, password_hashes)
+        db.session.commit()
+        imported += count
+        rejected += len(rejects)
+        for reject in rejects:
+            on_reject(*reject)
+        if on_progress:
+            on_progress(read, imported, rejected)
+
+    try:
+        for batch in importer.batched(records, batch_size):
+            read += len(batch)
+            entries = []
+            for line, row in batch:
+                try:
+                    entries.append((line, row, validate(row)))
+                except RowError as error:
+                    rejected += 1
+                    on_reject(line, row, str(error))
+            # Start hashing this batch before the previous one is written
+            password_hashes = pool.map(generate_password_hash, [clean['password'] for _, _, clean in entries],
+                                       chunksize=16) if pool else None
+            if pending:
+                flush(*pending)
+            pending = (entries, password_hashes)
+        if pending:
+            flush(*pending)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    if kind != 'academic-projects' and imported:
+        RecommendationCache.query.delete()
+        db.session.commit()
+    if kind == 'projects' and imported:
+        rebuild_facets()
+    invalidate_pages('all')
+    return imported, rejected
 
 def create_sample_data():
     """Create sample data only if it doesn't already exist"""
@@ -983,6 +2701,7 @@ def create_sample_data():
         # Add users to database
         for user in users:
             user.set_password('password123')  # Set a default password for all users
+            set_user_skills(user)
             db.session.add(user)
         db.session.commit()
         
@@ -1027,7 +2746,9 @@ def create_sample_data():
 
         # Add projects to database
         for project in projects:
+            set_project_skills(project)
             db.session.add(project)
+            update_facets(set(), project_facets(project))
         db.session.commit()
 
         # Create sample academic projects
@@ -1072,8 +2793,15 @@ def create_sample_data():
 def init_db():
     """Initialize the database with the correct schema"""
     try:
-        # Create tables if they don't exist
-        db.create_all()
+        # Create tables if they don't exist, or migrate them to the latest version
+        upgrade_database()
+        # Build the skill index for databases created before it existed
+        if Skill.query.first() is None:
+            backfill_skill_index()
+        setup_search_index()
+        # Count facets for databases created before the facet table existed
+        if Facet.query.first() is None and Project.query.first() is not None:
+            rebuild_facets()
         
         # Check if we need to add sample data
         if User.query.count() == 0:
@@ -1086,24 +2814,251 @@ def init_db():
         print(f"Error initializing database: {str(e)}")
         return f"Error initializing database: {str(e)}"
 
-@app.route('/init-db')
+@bp.route('/init-db')
 def init_database():
     """Route to initialize the database"""
-    with app.app_context():
-        return init_db()
+    return init_db()
+
+@bp.cli.command('init-db')
+def init_db_command():
+    """Create or upgrade the schema and build the indexes; run once before starting the server"""
+    print(init_db())
+
+@bp.cli.command('backfill-skills')
+def backfill_skills_command():
+    """Rebuild the skill index from the comma-separated skill columns"""
+    backfill_skill_index()
+    print('Skill index rebuilt.')
+
+@bp.cli.command('rebuild-search')
+def rebuild_search_command():
+    """Rebuild the full-text search indexes from the project and user tables"""
+    setup_search_index(rebuild=True)
+    print('Search indexes rebuilt.')
+
+@bp.cli.command('rebuild-facets')
+def rebuild_facets_command():
+    """Recount the tag and skill facets from the project table"""
+    rebuild_facets()
+    print('Facets rebuilt.')
+
+@bp.cli.command('generate-data')
+@click.option('--users', type=int, default=1000)
+@click.option('--projects', type=int, default=1000)
+@click.option('--messages', type=int, default=5000)
+@click.option('--reviews', type=int, default=1000)
+@click.option('--seed', type=int, default=42)
+def generate_data_command(users, projects, messages, reviews, seed):
+    """Add a seeded synthetic data set, e.g. to try the app at scale"""
+    data = load_synthetic_data(users, projects, messages, reviews, seed)
+    print(', '.join(f'{len(rows)} {name}' for name, rows in data.items()) + ' added.')
+
+@bp.cli.command('import-data')
+@click.argument('kind', type=click.Choice(list(IMPORT_WRITERS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'format_', type=click.Choice(['csv', 'jsonl']), help='Defaults to the file extension.')
+@click.option('--batch-size', type=int, default=1000, help='Rows per insert and per transaction.')
+@click.option('--workers', type=int, help='Password hashing processes; defaults to the CPU count.')
+@click.option('--rejects', type=click.Path(dir_okay=False), help='Write rejected rows and reasons here as JSON lines.')
+def import_data_command(kind, path, format_, batch_size, workers, rejects):
+    """Bulk-import users, projects or academic projects from a CSV or JSON Lines file"""
+    format_ = format_ or importer.detect_format(path)
+    rejects_file = open(rejects, 'w') if rejects else None
+
+    def on_reject(line, row, reason):
+        if isinstance(row, dict):
+            row = {key: value for key, value in row.items() if key != 'password'}
+        else:
+            row = None
+        if rejects_file:
+            rejects_file.write(json.dumps({'line': line, 'reason': reason, 'row': row}, default=str) + '\n')
+        else:
+            click.echo(f'line {line}: {reason}', err=True)
+
+    def on_progress(read, imported, rejected):
+        click.echo(f'{read} rows read, {imported} imported, {rejected} rejected', err=True)
+
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            imported, rejected = import_records(kind, importer.read_rows(f, format_), batch_size, workers,
+                                                on_reject, on_progress)
+    finally:
+        if rejects_file:
+            rejects_file.close()
+    print(f'{imported} {kind} imported, {rejected} rejected.')
+
+@bp.cli.command('export-data')
+@click.argument('kind', type=click.Choice(list(EXPORTS)))
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='File to write; defaults to stdout.')
+@click.option('--updated-since', help='Only rows changed at or after this ISO 8601 timestamp.')
+@click.option('--gzip', 'compress', is_flag=True, help='Gzip the output (implied by an --output ending in .gz).')
+@click.option('--batch-size', type=int, default=1000, help='Rows fetched per database round trip.')
+def export_data_command(kind, output, updated_since, compress, batch_size):
+    """Stream a table as newline-delimited JSON, e.g. for analytics"""
+    try:
+        since = parse_updated_since(updated_since) if updated_since else None
+    except ValueError:
+        raise click.BadParameter('must be an ISO 8601 timestamp', param_hint='--updated-since')
+    lines = export_lines(kind, since, batch_size)
+    compress = compress or bool(output and output.endswith('.gz'))
+    with click.open_file(output or '-', 'wb') as f:
+        for chunk in gzip_chunks(lines) if compress else (line.encode() for line in lines):
+            f.write(chunk)
+
+@bp.cli.group('skill-alias')
+def skill_alias_cli():
+    """Manage alternative spellings that are saved as a canonical skill or tag"""
 
-@app.route('/reset-db')
+@skill_alias_cli.command('list')
+def skill_alias_list_command():
+    """Show every alias and its canonical name"""
+    for alias in SkillAlias.query.order_by(SkillAlias.alias):
+        print(f'{alias.alias} -> {alias.canonical}')
+
+@skill_alias_cli.command('add')
+@click.argument('alias')
+@click.argument('canonical')
+def skill_alias_add_command(alias, canonical):
+    """Save ALIAS as CANONICAL, e.g. add "UX Design" "UI Design", and rewrite existing uses"""
+    try:
+        users, projects = add_skill_alias(alias, canonical)
+    except ValueError as error:
+        raise click.UsageError(str(error))
+    print(f'Alias added; {users} users and {projects} projects rewritten.')
+
+@skill_alias_cli.command('remove')
+@click.argument('alias')
+def skill_alias_remove_command(alias):
+    """Stop rewriting ALIAS; skills and tags already rewritten stay as they are"""
+    removed = SkillAlias.query.filter_by(alias=normalize(alias)).delete()
+    db.session.commit()
+    print('Alias removed.' if removed else 'No such alias.')
+
+@bp.cli.command('verify-aggregates')
+@click.option('--fix', is_flag=True, help='Rewrite drifted users from the recount.')
+def verify_aggregates_command(fix):
+    """Recount user rating and XP totals from scratch and report drift"""
+    drifted = verify_user_aggregates(fix=fix)
+    for user, stored, expected in drifted:
+        print(f'{user.username}: stored {stored}, expected {expected}')
+    if not drifted:
+        print('All user aggregates match.')
+    elif fix:
+        print(f'Fixed {len(drifted)} users.')
+    else:
+        print(f'{len(drifted)} users drifted; rerun with --fix to repair.')
+
+@bp.cli.group('migrate')
+def migrate_cli():
+    """Upgrade, downgrade or inspect the database schema version"""
+
+@migrate_cli.command('status')
+def migrate_status_command():
+    """Show the applied schema version and every migration"""
+    with db.engine.connect() as connection:
+        version = schema.current_version(connection)
+    print(f'Current version: {version if version is not None else "unversioned"}')
+    for migration in schema.load_migrations():
+        state = 'applied' if version is not None and migration.version <= version else 'pending'
+        print(f'  {migration.version:04d} {migration.description} [{state}]')
+
+@migrate_cli.command('upgrade')
+@click.option('--to', 'target', type=int, default=None, help='Version to upgrade to (default: latest).')
+def migrate_upgrade_command(target):
+    """Apply pending migrations"""
+    applied = schema.upgrade(db.engine, target)
+    for migration in applied:
+        print(f'Applied {migration.version:04d} {migration.description}')
+    if not applied:
+        print('Database is already up to date.')
+
+@migrate_cli.command('downgrade')
+@click.option('--to', 'target', type=int, required=True, help='Version to downgrade to (0 reverts everything).')
+def migrate_downgrade_command(target):
+    """Revert migrations newer than a version"""
+    reverted = schema.downgrade(db.engine, target)
+    for migration in reverted:
+        print(f'Reverted {migration.version:04d} {migration.description}')
+    if not reverted:
+        print('Nothing to revert.')
+
+@bp.route('/reset-db')
 def reset_database():
     """Route to completely reset the database (warning: deletes all user data)"""
     try:
-        with app.app_context():
-            db.drop_all()
-            db.create_all()
-            return create_sample_data()
+        db.drop_all()
+        db.create_all()
+        schema.stamp(db.engine, schema.head())
+        setup_search_index(rebuild=True)
+        invalidate_pages('all')
+        return create_sample_data()
     except Exception as e:
         return f"Error resetting database: {str(e)}"
 
+def load_secret_key(app):
+    """The SECRET_KEY environment variable, or a key kept in the instance folder.
+
+    Every worker process reads the same key, so a session signed by one
+    worker is accepted by the others. The key file is created on first use.
+    """
+    if os.environ.get('SECRET_KEY'):
+        return os.environ['SECRET_KEY']
+    path = os.path.join(app.instance_path, 'secret_key')
+    if not os.path.exists(path):
+        os.makedirs(app.instance_path, exist_ok=True)
+        # Write to a private file and link it into place, so that workers starting
+        # together all end up with whichever key was linked first
+        candidate = f'{path}.{os.getpid()}'
+        with open(os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(candidate, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(candidate)
+    with open(path) as f:
+        return f.read().strip()
+
+def add_slow_query_file(path):
+    """Append slow queries to the file at path too, once per process."""
+    path = os.path.abspath(path)
+    if not any(getattr(handler, 'baseFilename', None) == path for handler in slow_query_log.handlers):
+        handler = logging.FileHandler(path)
+        handler.setFormatter(logging.Formatter('%(asctime)s pid=%(process)d %(message)s'))
+        slow_query_log.addHandler(handler)
+
+def create_app(config=None):
+    """Build the application; config overrides the defaults and the environment settings.
+
+    Nothing touches the database here, so any number of worker processes can
+    import the app. Run `flask --app main init-db` once to create or upgrade
+    the schema first.
+    """
+    app = Flask(__name__)
+    app.config.from_mapping(DEFAULT_CONFIG)
+    app.config.update(storage.database_config())
+    app.config.update(config or {})
+    if config and 'SQLALCHEMY_DATABASE_URI' in config and 'SQLALCHEMY_ENGINE_OPTIONS' not in config:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = storage.engine_options(config['SQLALCHEMY_DATABASE_URI'], os.environ)
+    if not app.config.get('SECRET_KEY'):
+        app.config['SECRET_KEY'] = load_secret_key(app)
+
+    if app.config['SLOW_QUERY_LOG']:
+        add_slow_query_file(app.config['SLOW_QUERY_LOG'])
+
+    db.init_app(app)
+    login_manager.init_app(app)
+    app.extensions['page_cache'] = PageCache(page_cache_backend(app.config))
+    app.register_blueprint(bp)
+    app.register_blueprint(api)
+    with app.app_context():
+        for engine in db.engines.values():
+            storage.tune_sqlite(engine, app.config['SQLITE_PRAGMAS'])
+    return app
+
 if __name__ == '__main__':
+    app = create_app()
     with app.app_context():
         # Initialize the database but preserve existing users
         init_db()
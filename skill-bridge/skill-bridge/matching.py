@@ -0,0 +1,84 @@
+import numpy as np
+
+def parse_skills(skills):
+    """Split a comma-separated skills string into a set of canonical skill names."""
+    if not skills:
+        return set()
+    return {skill.strip().lower() for skill in skills.split(',') if skill.strip()}
+
+def calculate_skill_match(user_skills, project_skills):
+    if not user_skills or not project_skills:
+        return 0
+
+    # Convert comma-separated strings to sets of cleaned skills
+    user_skill_set = parse_skills(user_skills)
+    project_skill_set = parse_skills(project_skills)
+
+    # Calculate intersection and union
+    matching_skills = user_skill_set.intersection(project_skill_set)
+    total_project_skills = len(project_skill_set)
+
+    # Calculate match percentage based on project requirements met
+    if total_project_skills == 0:
+        return 0
+
+    match_percentage = (len(matching_skills) / total_project_skills) * 100
+    return round(match_percentage)
+
+class SkillMatchEngine:
+    """Scores one user against every project at once using packed skill bitmasks.
+
+    Each canonical skill name is given a bit position, and every project is
+    stored as a row of 64-bit words in a NumPy array. Scoring a user is then a
+    bitwise AND, a popcount and a divide over the whole catalog, and gives the
+    same percentages as calculate_skill_match.
+    """
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.project_ids = np.zeros(0, dtype=np.int64)
+        self.masks = np.zeros((0, 1), dtype=np.uint64)
+        self.totals = np.zeros(0, dtype=np.int64)
+        self.version = None
+
+    def load(self, project_skills, version=None):
+        """Rebuild the engine from (project_id, skill names) pairs."""
+        vocabulary = {}
+        project_ids = []
+        rows = []
+        bits = []
+        for row, (project_id, names) in enumerate(project_skills):
+            project_ids.append(project_id)
+            for name in names:
+                bit = vocabulary.setdefault(name, len(vocabulary))
+                rows.append(row)
+                bits.append(bit)
+
+        words = max(1, (len(vocabulary) + 63) // 64)
+        masks = np.zeros((len(project_ids), words), dtype=np.uint64)
+        if rows:
+            bits = np.asarray(bits, dtype=np.uint64)
+            np.bitwise_or.at(
+                masks,
+                (np.asarray(rows), (bits >> np.uint64(6)).astype(np.intp)),
+                np.left_shift(np.uint64(1), bits & np.uint64(63))
+            )
+        self.vocabulary, self.masks, self.version = vocabulary, masks, version
+        self.project_ids = np.asarray(project_ids, dtype=np.int64)
+        self.totals = np.bitwise_count(masks).sum(axis=1, dtype=np.int64)
+
+    def encode(self, skills):
+        """Pack a skills string into a bitmask row; skills no project needs are dropped."""
+        mask = np.zeros(self.masks.shape[1], dtype=np.uint64)
+        for name in parse_skills(skills):
+            bit = self.vocabulary.get(name)
+            if bit is not None:
+                mask[bit >> 6] |= np.uint64(1) << np.uint64(bit & 63)
+        return mask
+
+    def scores(self, user_skills):
+        """Match percentage of the user against every loaded project, aligned with project_ids."""
+        matched = np.bitwise_count(self.masks & self.encode(user_skills)).sum(axis=1, dtype=np.int64)
+        percentages = np.zeros(len(self.totals), dtype=np.float64)
+        np.divide(matched, self.totals, out=percentages, where=self.totals > 0)
+        return np.rint(percentages * 100).astype(np.int64)
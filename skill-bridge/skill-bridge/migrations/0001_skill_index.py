@@ -0,0 +1,42 @@
+"""Skill index, recommendation cache and facet tables
+
+The rows are filled in by the application on startup (backfill_skill_index,
+rebuild_facets) because they are derived from the existing text columns.
+"""
+import sqlalchemy as sa
+
+TABLES = ['skill', 'user_skill', 'project_skill', 'recommendation_cache', 'facet']
+
+def upgrade(op):
+    op.create_table(
+        'skill',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('name', sa.String(100), nullable=False, unique=True, index=True)
+    )
+    op.create_table(
+        'user_skill',
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('user.id'), primary_key=True),
+        sa.Column('skill_id', sa.Integer, sa.ForeignKey('skill.id'), primary_key=True, index=True)
+    )
+    op.create_table(
+        'project_skill',
+        sa.Column('project_id', sa.Integer, sa.ForeignKey('project.id'), primary_key=True),
+        sa.Column('skill_id', sa.Integer, sa.ForeignKey('skill.id'), primary_key=True, index=True)
+    )
+    op.create_table(
+        'recommendation_cache',
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('user.id'), primary_key=True),
+        sa.Column('project_ids', sa.JSON),
+        sa.Column('user_ids', sa.JSON),
+        sa.Column('updated_at', sa.DateTime)
+    )
+    op.create_table(
+        'facet',
+        sa.Column('kind', sa.String(20), primary_key=True),
+        sa.Column('value', sa.String(100), primary_key=True),
+        sa.Column('count', sa.Integer, nullable=False)
+    )
+
+def downgrade(op):
+    for table in reversed(TABLES):
+        op.drop_table(table)
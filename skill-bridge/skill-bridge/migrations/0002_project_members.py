@@ -0,0 +1,35 @@
+"""Project team membership table replacing the project.collaborators list"""
+import sqlalchemy as sa
+
+def upgrade(op):
+    op.create_table(
+        'project_member',
+        sa.Column('project_id', sa.Integer, sa.ForeignKey('project.id'), primary_key=True),
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('user.id'), primary_key=True, index=True),
+        sa.Column('role', sa.String(20), nullable=False),
+        sa.Column('joined_at', sa.DateTime)
+    )
+    if not op.has_column('project', 'collaborators'):
+        return
+    user_ids = {user_id for (user_id,) in op.execute('SELECT id FROM "user"')}
+    rows = op.execute(
+        "SELECT id, collaborators FROM project WHERE collaborators IS NOT NULL AND collaborators != ''"
+    ).all()
+    for project_id, collaborators in rows:
+        member_ids = {int(value) for value in collaborators.split(',') if value.strip().isdigit()}
+        for user_id in sorted(member_ids & user_ids):
+            op.execute(
+                "INSERT INTO project_member (project_id, user_id, role, joined_at) "
+                "SELECT :project_id, :user_id, 'collaborator', CURRENT_TIMESTAMP "
+                "WHERE NOT EXISTS (SELECT 1 FROM project_member WHERE project_id = :project_id AND user_id = :user_id)",
+                {'project_id': project_id, 'user_id': user_id}
+            )
+    op.drop_column('project', 'collaborators')
+
+def downgrade(op):
+    op.add_column('project', 'collaborators', 'VARCHAR(500)')
+    op.execute(
+        "UPDATE project SET collaborators = ("
+        "SELECT group_concat(user_id, ',') FROM project_member WHERE project_member.project_id = project.id)"
+    )
+    op.drop_table('project_member')
@@ -0,0 +1,25 @@
+"""Running rating and experience totals on user"""
+COLUMNS = ['rating_sum', 'rating_count', 'positive_review_count', 'completed_project_count']
+
+def upgrade(op):
+    op.add_column('user', 'rating_sum', 'FLOAT NOT NULL DEFAULT 0')
+    op.add_column('user', 'rating_count', 'INTEGER NOT NULL DEFAULT 0')
+    op.add_column('user', 'positive_review_count', 'INTEGER NOT NULL DEFAULT 0')
+    op.add_column('user', 'completed_project_count', 'INTEGER NOT NULL DEFAULT 0')
+    op.execute(
+        'UPDATE "user" SET '
+        'rating_sum = COALESCE((SELECT SUM(rating) FROM review WHERE reviewee_id = "user".id), 0), '
+        'rating_count = (SELECT COUNT(*) FROM review WHERE reviewee_id = "user".id), '
+        'positive_review_count = (SELECT COUNT(*) FROM review WHERE reviewee_id = "user".id AND rating >= 4), '
+        'completed_project_count = '
+        "(SELECT COUNT(*) FROM project WHERE creator_id = \"user\".id AND status = 'completed')"
+    )
+    op.execute(
+        'UPDATE "user" SET '
+        'experience_points = completed_project_count * 20 + positive_review_count * 5, '
+        'average_rating = CASE WHEN rating_count > 0 THEN rating_sum / rating_count ELSE 0 END'
+    )
+
+def downgrade(op):
+    for column in reversed(COLUMNS):
+        op.drop_column('user', column)
@@ -0,0 +1,48 @@
+"""Conversation threads with last-message pointers and unread counters"""
+import sqlalchemy as sa
+
+LOW = 'CASE WHEN sender_id < receiver_id THEN sender_id ELSE receiver_id END'
+HIGH = 'CASE WHEN sender_id < receiver_id THEN receiver_id ELSE sender_id END'
+
+def upgrade(op):
+    op.create_table(
+        'conversation',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('user_low_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('user_high_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('last_message_id', sa.Integer),
+        sa.Column('last_message_at', sa.DateTime),
+        sa.Column('low_unread', sa.Integer, nullable=False),
+        sa.Column('high_unread', sa.Integer, nullable=False),
+        sa.UniqueConstraint('user_low_id', 'user_high_id'),
+        sa.Index('ix_conversation_low_last', 'user_low_id', 'last_message_at'),
+        sa.Index('ix_conversation_high_last', 'user_high_id', 'last_message_at')
+    )
+    op.add_column('message', 'conversation_id', 'INTEGER REFERENCES conversation (id)')
+    op.create_index('ix_message_conversation_created', 'message', ['conversation_id', 'created_at'])
+
+    # Attach existing messages to a conversation per user pair
+    op.execute(
+        f'INSERT INTO conversation (user_low_id, user_high_id, low_unread, high_unread) '
+        f'SELECT DISTINCT {LOW}, {HIGH}, 0, 0 FROM message WHERE conversation_id IS NULL '
+        f'AND NOT EXISTS (SELECT 1 FROM conversation c WHERE c.user_low_id = {LOW} AND c.user_high_id = {HIGH})'
+    )
+    op.execute(
+        f'UPDATE message SET conversation_id = (SELECT id FROM conversation c '
+        f'WHERE c.user_low_id = {LOW} AND c.user_high_id = {HIGH}) WHERE conversation_id IS NULL'
+    )
+    op.execute(
+        'UPDATE conversation SET '
+        'last_message_id = (SELECT id FROM message m WHERE m.conversation_id = conversation.id '
+        'ORDER BY m.created_at DESC, m.id DESC LIMIT 1), '
+        'last_message_at = (SELECT MAX(created_at) FROM message m WHERE m.conversation_id = conversation.id), '
+        'low_unread = (SELECT COUNT(*) FROM message m WHERE m.conversation_id = conversation.id '
+        'AND m.receiver_id = conversation.user_low_id AND NOT m.is_read), '
+        'high_unread = (SELECT COUNT(*) FROM message m WHERE m.conversation_id = conversation.id '
+        'AND m.receiver_id = conversation.user_high_id AND NOT m.is_read)'
+    )
+
+def downgrade(op):
+    op.drop_index('ix_message_conversation_created')
+    op.drop_column('message', 'conversation_id')
+    op.drop_table('conversation')
@@ -0,0 +1,7 @@
+"""Partial index over unread messages per receiver and sender"""
+
+def upgrade(op):
+    op.create_index('ix_message_unread_receiver', 'message', ['receiver_id', 'sender_id'], where='is_read = 0')
+
+def downgrade(op):
+    op.drop_index('ix_message_unread_receiver')
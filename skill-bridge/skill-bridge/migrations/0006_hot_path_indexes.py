@@ -0,0 +1,18 @@
+"""Indexes for the inbox, listing, collaboration request and review queries"""
+INDEXES = [
+    ('ix_message_receiver_read', 'message', ['receiver_id', 'is_read']),
+    ('ix_message_sender_receiver_created', 'message', ['sender_id', 'receiver_id', 'created_at']),
+    ('ix_project_status_created', 'project', ['status', 'created_at']),
+    ('ix_project_creator_id', 'project', ['creator_id']),
+    ('ix_collaboration_request_project_status', 'collaboration_request', ['project_id', 'status']),
+    ('ix_collaboration_request_sender_created', 'collaboration_request', ['sender_id', 'created_at']),
+    ('ix_review_reviewee_id', 'review', ['reviewee_id']),
+]
+
+def upgrade(op):
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+def downgrade(op):
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name)
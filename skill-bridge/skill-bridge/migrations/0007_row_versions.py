@@ -0,0 +1,11 @@
+"""Row update timestamps on user and collaboration_request for API ETags"""
+
+def upgrade(op):
+    op.add_column('user', 'updated_at', 'DATETIME')
+    op.execute('UPDATE "user" SET updated_at = CURRENT_TIMESTAMP')
+    op.add_column('collaboration_request', 'updated_at', 'DATETIME')
+    op.execute('UPDATE collaboration_request SET updated_at = created_at')
+
+def downgrade(op):
+    op.drop_column('collaboration_request', 'updated_at')
+    op.drop_column('user', 'updated_at')
@@ -0,0 +1,12 @@
+"""Alias table mapping alternative skill and tag spellings to their canonical name"""
+import sqlalchemy as sa
+
+def upgrade(op):
+    op.create_table(
+        'skill_alias',
+        sa.Column('alias', sa.String(100), primary_key=True),
+        sa.Column('canonical', sa.String(100), nullable=False)
+    )
+
+def downgrade(op):
+    op.drop_table('skill_alias')
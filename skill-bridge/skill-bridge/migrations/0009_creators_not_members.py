@@ -0,0 +1,11 @@
+"""Remove project creators from their own project's members, as bulk imports and synthetic data added them"""
+
+def upgrade(op):
+    op.execute(
+        "DELETE FROM project_member WHERE EXISTS ("
+        "SELECT 1 FROM project WHERE project.id = project_member.project_id AND project.creator_id = project_member.user_id)"
+    )
+
+def downgrade(op):
+    # The removed rows only repeated project.creator_id, which is still there
+    pass
@@ -0,0 +1,19 @@
+"""Display spelling for skills, taken from the most common way users and projects spell them"""
+
+def upgrade(op):
+    op.add_column('skill', 'display_name', 'VARCHAR(100)')
+    spellings = {}
+    rows = op.execute('SELECT skills FROM "user" UNION ALL SELECT required_skills FROM project')
+    for (text,) in rows:
+        for term in (text or '').split(','):
+            if term.strip():
+                counts = spellings.setdefault(term.strip().lower(), {})
+                counts[term.strip()] = counts.get(term.strip(), 0) + 1
+    for skill_id, name in op.execute('SELECT id, name FROM skill').all():
+        if name in spellings:
+            counts = spellings[name]
+            op.execute('UPDATE skill SET display_name = :display_name WHERE id = :id',
+                       {'display_name': max(sorted(counts), key=counts.get)[:100], 'id': skill_id})
+
+def downgrade(op):
+    op.drop_column('skill', 'display_name')
@@ -0,0 +1,129 @@
+"""Rendered-page cache with tag-based invalidation.
+
+Each cached page is stored with the tags it was built from (for example
+'project:3' or 'user:7') and the current token of each tag. Invalidating a
+tag gives it a new timestamped token, so every page stored under the old one
+misses on its next lookup. Tokens live in the same backend as the pages, so
+invalidation reaches every worker when the backend is shared; a tag whose
+token was evicted also counts as changed.
+
+A backend is any object with get_many(keys) and set_many(mapping):
+LRUBackend keeps entries in process memory, and RedisBackend shares them
+between workers through a redis client.
+"""
+import pickle
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+def new_token():
+    """A tag token: when the tag was invalidated, plus a random part so that tokens never repeat."""
+    return (time.time(), secrets.token_hex(8))
+
+class LRUBackend:
+    """In-process store that drops the least recently used keys beyond max_entries."""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_many(self, keys):
+        values = []
+        with self.lock:
+            for key in keys:
+                value = self.entries.get(key)
+                if value is not None:
+                    self.entries.move_to_end(key)
+                values.append(value)
+        return values
+
+    def set_many(self, mapping):
+        with self.lock:
+            for key, value in mapping.items():
+                self.entries[key] = value
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+class RedisBackend:
+    """Store shared by all workers, on a redis.Redis client; pages expire after ttl seconds."""
+
+    def __init__(self, client, prefix='skillbridge:page:', ttl=3600):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        return [None if value is None else pickle.loads(value)
+                for value in self.client.mget([self.prefix + key for key in keys])]
+
+    def set_many(self, mapping):
+        pipeline = self.client.pipeline()
+        for key, value in mapping.items():
+            # Tag tokens never expire, or a page could outlive its tag
+            pipeline.set(self.prefix + key, pickle.dumps(value), ex=None if key.startswith('tag:') else self.ttl)
+        pipeline.execute()
+
+class PageCache:
+    """Rendered pages keyed by request, invalidated by tag, with hit and miss counters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """The stored value for key, or None if it is missing or any of its tags changed since."""
+        entry, = self.backend.get_many(['page:' + key])
+        if entry is not None:
+            tags, value = entry
+            current = self.backend.get_many(['tag:' + tag for tag in tags])
+            if current == list(tags.values()):
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key, value, tags, started=None):
+        """Store value under key, tied to the current token of each tag.
+
+        started is when the page began rendering: if a tag was invalidated since,
+        the page may already be out of date and is not stored.
+        """
+        tags = sorted(set(tags))
+        tokens = self.backend.get_many(['tag:' + tag for tag in tags])
+        if started is not None and any(token and token[0] >= started for token in tokens):
+            return
+        missing = {'tag:' + tag: new_token() for tag, token in zip(tags, tokens) if token is None}
+        if missing:
+            self.backend.set_many(missing)
+        tokens = [token or missing['tag:' + tag] for tag, token in zip(tags, tokens)]
+        self.backend.set_many({'page:' + key: (dict(zip(tags, tokens)), value)})
+        self.stores += 1
+
+    def invalidate(self, *tags):
+        """Expire every page stored under any of the tags."""
+        if tags:
+            self.backend.set_many({'tag:' + tag: new_token() for tag in set(tags)})
+            self.invalidations += len(set(tags))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'entries': len(self.backend) if hasattr(self.backend, '__len__') else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            'stores': self.stores,
+            'invalidations': self.invalidations
+        }
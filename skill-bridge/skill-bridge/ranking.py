@@ -0,0 +1,136 @@
+"""Weighted multi-signal ranking with heap-based top-k selection.
+
+Every candidate gets a value between 0 and 1 for each signal (skill match,
+recency, open seats, ...). Its score is the weighted mean of those values, so
+scores are between 0 and 1 as well and the weights only need to be relative.
+Only the k best candidates are kept, with a heap instead of a full sort, and
+each comes back with the breakdown of how every signal contributed.
+"""
+import heapq
+from typing import NamedTuple
+
+import numpy as np
+
+# Default signal weights; override them with the PROJECT_RANKING_WEIGHTS and USER_RANKING_WEIGHTS settings
+PROJECT_WEIGHTS = {'skill_match': 0.6, 'status': 0.15, 'recency': 0.15, 'headroom': 0.1}
+USER_WEIGHTS = {'skill_overlap': 0.6, 'experience': 0.2, 'rating': 0.2}
+
+# How much a project's status counts towards its rank
+STATUS_VALUES = {'active': 1.0, 'completed': 0.25, 'cancelled': 0.0}
+
+class Ranked(NamedTuple):
+    """One ranked candidate: its id, its score and each signal's share of the score."""
+    id: int
+    score: float
+    breakdown: dict
+
+def recency(timestamps, now, half_life_days):
+    """1.0 for something created at now, halving every half_life_days (timestamps in epoch seconds)."""
+    age_days = np.maximum(now - np.asarray(timestamps, dtype=np.float64), 0) / 86400
+    return 0.5 ** (age_days / half_life_days)
+
+def headroom(members, capacity):
+    """Share of a team's seats still open, from 0 (full) to 1 (empty)."""
+    capacity = np.asarray(capacity, dtype=np.float64)
+    open_seats = capacity - np.asarray(members, dtype=np.float64)
+    values = np.zeros(len(capacity))
+    np.divide(open_seats, capacity, out=values, where=capacity > 0)
+    return np.clip(values, 0, 1)
+
+def status(statuses):
+    return np.array([STATUS_VALUES.get(value, 0.0) for value in statuses], dtype=np.float64)
+
+def experience(points, scale=100):
+    """Experience points squashed into 0..1: scale points give 0.5, and more keeps helping less."""
+    points = np.maximum(np.asarray(points, dtype=np.float64), 0)
+    return points / (points + scale)
+
+def rating(average_ratings, best=5.0):
+    return np.clip(np.nan_to_num(np.asarray(average_ratings, dtype=np.float64)) / best, 0, 1)
+
+def weighted_scores(signals, weights):
+    """The weighted mean of the signals for every candidate."""
+    unknown = set(weights) - set(signals)
+    if unknown:
+        raise ValueError(f"Unknown ranking signals: {', '.join(sorted(unknown))}")
+    total_weight = sum(weights.values())
+    if total_weight <= 0:
+        raise ValueError('Ranking weights must add up to more than zero')
+    scores = np.zeros(len(next(iter(signals.values()))))
+    for name, weight in weights.items():
+        scores += weight * signals[name]
+    return scores / total_weight
+
+def top_k(ids, scores, k, mask=None, after=None):
+    """Positions of the k best candidates, best first, ties broken by ascending id.
+
+    A linear-time partition finds the k-th best score, and a k-sized heap orders
+    the few candidates at or above it, so the whole list is never sorted.
+
+    mask is a boolean array of candidates to consider, and after a (score, id)
+    keyset cursor: only candidates ranked below it are returned.
+    """
+    if mask is None:
+        mask = np.ones(len(ids), dtype=bool)
+    if after is not None:
+        score, last_id = after
+        mask = mask & ((scores < score) | ((scores == score) & (ids > last_id)))
+    positions = np.flatnonzero(mask)
+    if len(positions) > k > 0:
+        # Only candidates scoring at least the k-th best score (ties included) can make the top k
+        candidate_scores = scores[positions]
+        threshold = np.partition(candidate_scores, len(positions) - k)[len(positions) - k]
+        positions = positions[candidate_scores >= threshold]
+    keys = zip(scores[positions].tolist(), (-ids[positions]).tolist(), positions.tolist())
+    return [position for _, _, position in heapq.nlargest(k, keys)]
+
+def rank(ids, signals, weights, k, mask=None, after=None):
+    """The k best candidates as Ranked tuples.
+
+    ids is an array of candidate ids, and signals maps each signal name to an
+    array of values aligned with ids.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    scores = weighted_scores(signals, weights)
+    total_weight = sum(weights.values())
+    ranked = []
+    for position in top_k(ids, scores, k, mask, after):
+        breakdown = {name: {
+            'value': round(float(signals[name][position]), 4),
+            'weight': weight,
+            'contribution': round(float(weight * signals[name][position] / total_weight), 4)
+        } for name, weight in weights.items()}
+        ranked.append(Ranked(int(ids[position]), float(scores[position]), breakdown))
+    return ranked
+
+class ProjectCatalog:
+    """The non-skill ranking inputs of every project, as arrays ordered by project id."""
+
+    def __init__(self):
+        self.project_ids = np.zeros(0, dtype=np.int64)
+        self.status_values = np.zeros(0)
+        self.active = np.zeros(0, dtype=bool)
+        self.created = np.zeros(0)
+        self.capacity = np.zeros(0)
+        self.members = np.zeros(0)
+        self.version = None
+
+    def load(self, rows, version=None):
+        """Rebuild from (project_id, status, created_at epoch seconds, max_collaborators, member count) rows."""
+        rows = list(rows)
+        self.project_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.status_values = status([row[1] for row in rows])
+        self.active = np.array([row[1] == 'active' for row in rows], dtype=bool)
+        self.created = np.array([row[2] for row in rows], dtype=np.float64)
+        self.capacity = np.array([row[3] or 0 for row in rows], dtype=np.float64)
+        self.members = np.array([row[4] for row in rows], dtype=np.float64)
+        self.version = version
+
+    def signals(self, skill_match, now, half_life_days):
+        """Signal arrays for every project, given their skill match between 0 and 1."""
+        return {
+            'skill_match': np.asarray(skill_match, dtype=np.float64),
+            'status': self.status_values,
+            'recency': recency(self.created, now, half_life_days),
+            'headroom': headroom(self.members, self.capacity)
+        }
@@ -0,0 +1,143 @@
+"""Versioned, reversible schema migrations.
+
+Each script in migrations/ is named NNNN_description.py and defines
+upgrade(op) and downgrade(op), where op is an Operations object bound to the
+migration's transaction. The number of the last applied script is kept in
+the schema_version table, so an existing database upgrades in place.
+
+Scripts spell out every table, column and index they create instead of
+reading them from the models, so a version always means the same schema.
+"""
+import importlib.util
+import os
+import re
+
+import sqlalchemy as sa
+from sqlalchemy import inspect, text
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+VERSION_TABLE = 'schema_version'
+
+class Migration:
+    """One migration script, loaded from migrations/."""
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        spec = importlib.util.spec_from_file_location(f'migrations.m{version:04d}', path)
+        self.module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+        self.description = (self.module.__doc__ or name).strip().splitlines()[0]
+
+    def upgrade(self, op):
+        self.module.upgrade(op)
+
+    def downgrade(self, op):
+        self.module.downgrade(op)
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """All migration scripts in version order."""
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = re.fullmatch(r'(\d{4})_(\w+)\.py', filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    return migrations
+
+def head(migrations=None):
+    """The latest migration version."""
+    migrations = load_migrations() if migrations is None else migrations
+    return migrations[-1].version if migrations else 0
+
+class Operations:
+    """Schema operations available to migration scripts."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql, params=None):
+        return self.connection.execute(text(sql), params or {})
+
+    def has_table(self, table):
+        return inspect(self.connection).has_table(table)
+
+    def has_column(self, table, column):
+        return any(info['name'] == column for info in inspect(self.connection).get_columns(table))
+
+    def create_table(self, table, *columns):
+        """Create a table from sa.Column, sa.Index and constraint objects, if it does not exist yet."""
+        if self.has_table(table):
+            return
+        # Reflect the existing tables so that foreign keys to them resolve
+        metadata = sa.MetaData()
+        metadata.reflect(self.connection)
+        sa.Table(table, metadata, *columns).create(self.connection)
+
+    def drop_table(self, table):
+        self.execute(f'DROP TABLE IF EXISTS "{table}"')
+
+    def add_column(self, table, column, definition):
+        if not self.has_column(table, column):
+            self.execute(f'ALTER TABLE "{table}" ADD COLUMN {column} {definition}')
+
+    def drop_column(self, table, column):
+        if self.has_column(table, column):
+            self.execute(f'ALTER TABLE "{table}" DROP COLUMN {column}')
+
+    def create_index(self, name, table, columns, unique=False, where=None):
+        unique = 'UNIQUE ' if unique else ''
+        where = f' WHERE {where}' if where else ''
+        self.execute(f'CREATE {unique}INDEX IF NOT EXISTS {name} ON "{table}" ({", ".join(columns)}){where}')
+
+    def drop_index(self, name):
+        self.execute(f'DROP INDEX IF EXISTS {name}')
+
+def current_version(connection):
+    """The applied migration version, or None for a database that was never versioned."""
+    if not inspect(connection).has_table(VERSION_TABLE):
+        return None
+    return connection.execute(text(f'SELECT version FROM {VERSION_TABLE}')).scalar() or 0
+
+def set_version(connection, version):
+    connection.execute(text(f'CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (version INTEGER NOT NULL)'))
+    connection.execute(text(f'DELETE FROM {VERSION_TABLE}'))
+    connection.execute(text(f'INSERT INTO {VERSION_TABLE} (version) VALUES (:version)'), {'version': version})
+
+def stamp(engine, version):
+    """Record a version without running any scripts, e.g. after create_all on an empty database."""
+    with engine.begin() as connection:
+        set_version(connection, version)
+
+def upgrade(engine, target=None):
+    """Apply pending migrations up to target (default: the latest); returns the ones applied.
+
+    Each script runs in its own transaction together with the version bump.
+    """
+    migrations = load_migrations()
+    target = head(migrations) if target is None else target
+    with engine.connect() as connection:
+        version = current_version(connection) or 0
+    applied = []
+    for migration in migrations:
+        if version < migration.version <= target:
+            with engine.begin() as connection:
+                migration.upgrade(Operations(connection))
+                set_version(connection, migration.version)
+            applied.append(migration)
+    return applied
+
+def downgrade(engine, target):
+    """Revert applied migrations newer than target, newest first; returns the ones reverted."""
+    migrations = load_migrations()
+    with engine.connect() as connection:
+        version = current_version(connection) or 0
+    reverted = []
+    for position in range(len(migrations) - 1, -1, -1):
+        migration = migrations[position]
+        if target < migration.version <= version:
+            previous = migrations[position - 1].version if position else 0
+            with engine.begin() as connection:
+                migration.downgrade(Operations(connection))
+                set_version(connection, previous)
+            reverted.append(migration)
+    return reverted
@@ -0,0 +1,97 @@
+"""Multi-process smoke test: several workers serve one port and share logins.
+
+Initializes a scratch database, starts --workers processes that each build the
+app with create_app() and accept connections on the same listening socket, then
+logs in once and checks that every worker honours the session cookie.
+
+Usage: python smoke_workers.py [--workers 4] [--requests 40]
+"""
+import argparse
+import http.cookiejar
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import socket
+import sys
+import tempfile
+import urllib.parse
+import urllib.request
+
+from werkzeug.serving import make_server
+
+from main import create_app, init_db
+
+def serve(fd, config):
+    """Worker process: build the app on its own and serve the shared socket."""
+    app = create_app(config)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    @app.after_request
+    def tag_worker(response):
+        response.headers['X-Worker-Pid'] = str(os.getpid())
+        return response
+
+    make_server('127.0.0.1', 0, app, fd=fd).serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=40)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix='skillbridge-smoke-')
+    config = {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(scratch, 'smoke.db')}"}
+    # The one-time schema setup, done before any worker starts
+    app = create_app(config)
+    with app.app_context():
+        init_db()
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(128)
+    base_url = f'http://127.0.0.1:{listener.getsockname()[1]}'
+
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=serve, args=(listener.fileno(), config), daemon=True)
+               for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    seen = set()
+    failures = 0
+    try:
+        with opener.open(f'{base_url}/login') as response:
+            seen.add(response.headers['X-Worker-Pid'])
+            token = re.search(r'name="csrf_token" type="hidden" value="([^"]+)"', response.read().decode()).group(1)
+        form = urllib.parse.urlencode({'csrf_token': token, 'email': 'alice@example.com', 'password': 'password123'})
+        with opener.open(f'{base_url}/login', data=form.encode()) as response:
+            if '/login' in response.url:
+                print('Login failed: the CSRF token from one worker was rejected by another.')
+                return 1
+
+        for _ in range(args.requests):
+            with opener.open(f'{base_url}/messages') as response:
+                seen.add(response.headers['X-Worker-Pid'])
+                if '/login' in response.url:
+                    failures += 1
+    finally:
+        for worker in workers:
+            worker.terminate()
+        listener.close()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f'{args.requests} authenticated requests served by {len(seen)} of {args.workers} workers, '
+          f'{failures} redirected to login.')
+    if failures:
+        return 1
+    if args.workers > 1 and len(seen) < 2:
+        print('All requests reached one worker; rerun with more --requests to exercise the shared session.')
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
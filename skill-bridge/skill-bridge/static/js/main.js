@@ -62,6 +62,41 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
 
+    // Suggest known skills and tags, most used first, as the user types
+    const autocompleteUrl = document.body.dataset.autocompleteUrl;
+    const autocompleteInputs = document.querySelectorAll('input[name="skills"], input[name="other_skills"], input[name="required_skills"], input[name="tags"]');
+    autocompleteInputs.forEach(input => {
+        const list = document.createElement('datalist');
+        list.id = `${input.id || input.name}Suggestions`;
+        input.parentNode.appendChild(list);
+        input.setAttribute('list', list.id);
+        input.setAttribute('autocomplete', 'off');
+        const kind = input.name === 'tags' ? 'tag' : 'skill';
+        let timer;
+        input.addEventListener('input', function() {
+            clearTimeout(timer);
+            // Complete the term after the last comma
+            const term = this.value.split(',').pop().trim();
+            if (!term) {
+                return;
+            }
+            timer = setTimeout(() => {
+                fetch(`${autocompleteUrl}?kind=${kind}&q=${encodeURIComponent(term)}`)
+                    .then(response => response.json())
+                    .then(data => {
+                        const prefix = this.value.slice(0, this.value.lastIndexOf(',') + 1);
+                        list.innerHTML = '';
+                        data.suggestions.forEach(suggestion => {
+                            const option = document.createElement('option');
+                            option.value = prefix ? `${prefix} ${suggestion.value}` : suggestion.value;
+                            list.appendChild(option);
+                        });
+                    })
+                    .catch(() => {});
+            }, 150);
+        });
+    });
+
     // Project search functionality
     const searchInput = document.getElementById('projectSearch');
     if (searchInput) {
@@ -151,6 +186,85 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
+    // Unread message badge
+    const unreadBadge = document.getElementById('unreadBadge');
+    function refreshUnreadBadge() {
+        if (!unreadBadge) {
+            return;
+        }
+        fetch(unreadBadge.dataset.unreadUrl)
+            .then(response => response.json())
+            .then(data => {
+                unreadBadge.textContent = data.total;
+                if (!data.senders.length) {
+                    return;
+                }
+                const menu = document.getElementById('unreadMenu');
+                menu.innerHTML = '';
+                data.senders.forEach(sender => {
+                    const item = document.createElement('li');
+                    const link = document.createElement('a');
+                    link.className = 'dropdown-item';
+                    link.href = unreadBadge.dataset.conversationUrl.replace(/0$/, sender.id);
+                    link.textContent = `${sender.count} unread message${sender.count > 1 ? 's' : ''} from ${sender.username}`;
+                    item.appendChild(link);
+                    menu.appendChild(item);
+                });
+            })
+            .catch(() => {});
+    }
+    refreshUnreadBadge();
+
+    // Add an incoming message to the open conversation
+    function appendMessage(thread, message) {
+        const empty = document.getElementById('emptyThread');
+        if (empty) {
+            empty.remove();
+        }
+        const row = document.createElement('div');
+        row.className = 'd-flex mb-3';
+        const bubble = document.createElement('div');
+        bubble.className = 'message bg-light';
+        bubble.style.cssText = 'max-width: 75%; padding: 10px 15px; border-radius: 18px;';
+        const content = document.createElement('div');
+        content.className = 'message-content';
+        content.textContent = message.content;
+        const time = document.createElement('div');
+        time.className = 'message-time text-end';
+        time.style.fontSize = '0.75rem';
+        time.textContent = message.created_at.slice(11, 16);
+        bubble.appendChild(content);
+        bubble.appendChild(time);
+        row.appendChild(bubble);
+        thread.appendChild(row);
+        thread.scrollTop = thread.scrollHeight;
+    }
+
+    // Live messages and collaboration requests pushed by the server
+    const eventsUrl = document.body.dataset.eventsUrl;
+    if (eventsUrl && window.EventSource) {
+        const source = new EventSource(eventsUrl);
+        source.addEventListener('message', function(e) {
+            const message = JSON.parse(e.data);
+            const thread = document.getElementById('messageContainer');
+            if (thread && Number(thread.dataset.otherUserId) === message.sender_id) {
+                appendMessage(thread, message);
+            } else {
+                showNotification(`New message from ${message.sender}`);
+                refreshUnreadBadge();
+            }
+        });
+        source.addEventListener('collaboration_request', function(e) {
+            const collabRequest = JSON.parse(e.data);
+            if (collabRequest.status === 'pending') {
+                showNotification(`${collabRequest.sender} wants to collaborate on ${collabRequest.project}`);
+            } else {
+                showNotification(`Your request to join ${collabRequest.project} was ${collabRequest.status}`,
+                                 collabRequest.status === 'accepted' ? 'success' : 'info');
+            }
+        });
+    }
+
     // Mobile menu toggle enhancement
     const navbarToggler = document.querySelector('.navbar-toggler');
     if (navbarToggler) {
@@ -0,0 +1,68 @@
+"""Database connection settings.
+
+URLs and pool sizes come from the environment so the same code can run on
+the bundled SQLite file or on a server database:
+
+    DATABASE_URL            primary (read/write) database, default sqlite:///skillbridge.db
+    DATABASE_READ_URL       optional database for read-only routes, e.g. a replica
+    DATABASE_POOL_SIZE      connections kept open per engine (default 5)
+    DATABASE_MAX_OVERFLOW   extra connections allowed under load (default 10)
+    DATABASE_POOL_TIMEOUT   seconds to wait for a free connection (default 30)
+    DATABASE_POOL_RECYCLE   seconds before a connection is replaced (default 1800)
+    DATABASE_BUSY_TIMEOUT   SQLite only: milliseconds to wait on a locked database (default 5000)
+"""
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+DEFAULT_DATABASE_URL = 'sqlite:///skillbridge.db'
+
+# Applied to every new SQLite connection. WAL lets readers run while a write is
+# in progress, and synchronous=NORMAL is safe in WAL mode while avoiding an
+# fsync per commit.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
+def engine_options(url, environ):
+    """SQLAlchemy engine options for url; in-memory SQLite keeps SQLAlchemy's single-connection pool."""
+    url = make_url(url)
+    options = {'pool_pre_ping': True}
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return options
+    options.update(
+        pool_size=int(environ.get('DATABASE_POOL_SIZE', 5)),
+        max_overflow=int(environ.get('DATABASE_MAX_OVERFLOW', 10)),
+        pool_timeout=int(environ.get('DATABASE_POOL_TIMEOUT', 30)),
+        pool_recycle=int(environ.get('DATABASE_POOL_RECYCLE', 1800))
+    )
+    return options
+
+def database_config(environ=os.environ):
+    """Flask-SQLAlchemy settings for the primary database, plus a 'read' bind when DATABASE_READ_URL is set."""
+    url = environ.get('DATABASE_URL', DEFAULT_DATABASE_URL)
+    config = {
+        'SQLALCHEMY_DATABASE_URI': url,
+        'SQLALCHEMY_ENGINE_OPTIONS': engine_options(url, environ),
+        'SQLITE_PRAGMAS': dict(SQLITE_PRAGMAS, busy_timeout=int(environ.get('DATABASE_BUSY_TIMEOUT', 5000)))
+    }
+    read_url = environ.get('DATABASE_READ_URL')
+    if read_url:
+        config['SQLALCHEMY_BINDS'] = {'read': {'url': read_url, **engine_options(read_url, environ)}}
+    return config
+
+def tune_sqlite(engine, pragmas):
+    """Run the given pragmas on every new connection of a SQLite engine; other engines are left alone."""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
@@ -0,0 +1,159 @@
+"""Seeded synthetic users, projects, memberships, messages and reviews.
+
+Skills follow a long tail, as in real sign-ups: a few common skills are on most
+profiles and the rest are rare. A handful of users send most of the messages.
+The same seed always gives the same rows. Rows are plain dicts with explicit
+ids starting after the given offsets, ready for bulk inserts.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+MAJORS = ['Computer Science', 'Art', 'Business', 'Psychology', 'Biology', 'Economics', 'Other']
+COMMON_SKILLS = ['Python', 'JavaScript', 'React', 'UI Design', 'Data Analysis', 'Machine Learning',
+                 'Graphic Design', 'Digital Marketing', 'Project Management', 'Research', 'Writing',
+                 'Mobile Development']
+TAGS = ['web', 'mobile', 'ai', 'research', 'design', 'startup', 'education', 'health', 'games',
+        'sustainability', 'finance', 'social', 'music', 'data', 'hackathon']
+WORDS = ['campus', 'study', 'planner', 'market', 'green', 'tracker', 'network', 'learning', 'budget',
+         'health', 'art', 'map', 'event', 'food', 'music', 'tutor', 'club', 'data', 'vision', 'assistant']
+
+def make_vocabulary(size):
+    """Skill names with a long tail: a few common skills and many rare ones."""
+    return COMMON_SKILLS + [f'Skill {i}' for i in range(max(0, size - len(COMMON_SKILLS)))]
+
+def skill_weights(vocabulary):
+    """Zipf weights: the skill at rank r is picked with probability proportional to 1 / r."""
+    return [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+def random_skills(rng, vocabulary, weights, low=2, high=6):
+    """A comma-separated skills string as users type it into the forms."""
+    picks = rng.choices(vocabulary, weights=weights, k=rng.randint(low, high))
+    return ', '.join(dict.fromkeys(picks))
+
+def random_time(rng, now, days=365):
+    return now - timedelta(seconds=rng.randint(0, days * 24 * 3600))
+
+def sentence(rng, low=6, high=20):
+    return ' '.join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize() + '.'
+
+def generate(users, projects, messages, reviews, seed=42, vocabulary=300, id_offsets=None, now=None):
+    """Build the rows for one synthetic data set.
+
+    Returns a dict of row lists: 'users', 'projects', 'members', 'conversations',
+    'messages' and 'reviews'. id_offsets maps those names to the largest id
+    already in use, so new rows never collide with existing ones.
+    """
+    rng = random.Random(seed)
+    offsets = dict(id_offsets or {})
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    skills = make_vocabulary(vocabulary)
+    weights = skill_weights(skills)
+
+    user_rows = []
+    for user_id in range(offsets.get('users', 0) + 1, offsets.get('users', 0) + users + 1):
+        user_rows.append({
+            'id': user_id,
+            'username': f'{rng.choice(WORDS)}_{user_id}',
+            'email': f'user{user_id}@example.edu',
+            'major': rng.choice(MAJORS),
+            'skills': random_skills(rng, skills, weights),
+            'interests': ', '.join(rng.sample(TAGS, 2)),
+            'bio': sentence(rng),
+            'profile_image': f'https://i.pravatar.cc/150?img={user_id % 70}'
+        })
+    user_ids = [row['id'] for row in user_rows]
+
+    project_rows, member_rows = [], []
+    for project_id in range(offsets.get('projects', 0) + 1, offsets.get('projects', 0) + projects + 1):
+        creator_id = rng.choice(user_ids)
+        created_at = random_time(rng, now)
+        project_rows.append({
+            'id': project_id,
+            'title': ' '.join(rng.sample(WORDS, 3)).title(),
+            'description': sentence(rng, 20, 60),
+            'required_skills': random_skills(rng, skills, weights, 2, 5),
+            'tags': ', '.join(rng.sample(TAGS, rng.randint(1, 3))),
+            'creator_id': creator_id,
+            'created_at': created_at,
+            'updated_at': created_at,
+            'status': rng.choices(['active', 'completed', 'cancelled'], weights=[70, 25, 5])[0],
+            'max_collaborators': rng.randint(2, 8)
+        })
+        # As in the app, the creator owns the project without being one of its members
+        team_size = min(len(user_ids), rng.randint(0, 4), project_rows[-1]['max_collaborators'])
+        for user_id in sorted(set(rng.sample(user_ids, team_size)) - {creator_id}):
+            member_rows.append({
+                'project_id': project_id,
+                'user_id': user_id,
+                'role': 'collaborator',
+                'joined_at': created_at
+            })
+
+    # Message senders and receivers are skewed towards a few very active users
+    # (cumulative, so that each pick does not re-add every user's weight)
+    activity = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(user_ids))))
+    conversations = {}
+    message_rows = []
+    next_conversation_id = offsets.get('conversations', 0) + 1
+    for message_id in range(offsets.get('messages', 0) + 1, offsets.get('messages', 0) + messages + 1):
+        if len(user_ids) < 2:
+            break
+        sender_id, receiver_id = rng.choices(user_ids, cum_weights=activity, k=2)
+        while receiver_id == sender_id:
+            receiver_id = rng.choice(user_ids)
+        low, high = sorted((sender_id, receiver_id))
+        conversation = conversations.get((low, high))
+        if conversation is None:
+            conversation = conversations[low, high] = {
+                'id': next_conversation_id, 'user_low_id': low, 'user_high_id': high,
+                'last_message_id': None, 'last_message_at': None, 'low_unread': 0, 'high_unread': 0
+            }
+            next_conversation_id += 1
+        created_at = random_time(rng, now, 90)
+        is_read = rng.random() < 0.7
+        message_rows.append({
+            'id': message_id,
+            'sender_id': sender_id,
+            'receiver_id': receiver_id,
+            'content': sentence(rng, 3, 25),
+            'created_at': created_at,
+            'is_read': is_read,
+            'conversation_id': conversation['id']
+        })
+        if conversation['last_message_at'] is None or created_at >= conversation['last_message_at']:
+            conversation['last_message_id'], conversation['last_message_at'] = message_id, created_at
+        if not is_read:
+            conversation['low_unread' if receiver_id == low else 'high_unread'] += 1
+
+    # Reviews of completed projects' members are left by the creator or another member
+    teams = {row['id']: [row['creator_id']] for row in project_rows}
+    for row in member_rows:
+        teams[row['project_id']].append(row['user_id'])
+    completed = [row['id'] for row in project_rows if row['status'] == 'completed' and len(teams[row['id']]) > 1]
+    review_rows = []
+    review_id = offsets.get('reviews', 0)
+    while completed and len(review_rows) < reviews:
+        project_id = rng.choice(completed)
+        reviewee_id = rng.choice(teams[project_id][1:])
+        reviewer_id = rng.choice([user_id for user_id in teams[project_id] if user_id != reviewee_id])
+        review_id += 1
+        review_rows.append({
+            'id': review_id,
+            'reviewer_id': reviewer_id,
+            'reviewee_id': reviewee_id,
+            'project_id': project_id,
+            'rating': float(rng.choices([1, 2, 3, 4, 5], weights=[3, 5, 15, 40, 37])[0]),
+            'comment': sentence(rng),
+            'feedback_tags': ', '.join(rng.sample(['reliable', 'creative', 'communicative', 'on time'], 2)),
+            'created_at': random_time(rng, now, 180)
+        })
+
+    return {
+        'users': user_rows,
+        'projects': project_rows,
+        'members': member_rows,
+        'conversations': list(conversations.values()),
+        'messages': message_rows,
+        'reviews': review_rows
+    }
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from main import RecommendationCache, create_app, db, init_db, load_synthetic_data
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """An app on a scratch database with the sample data and a small synthetic data set."""
+    path = tmp_path_factory.mktemp('db') / 'skillbridge.db'
+    app = create_app({
+        'TESTING': True,
+        'SECRET_KEY': 'test',
+        'WTF_CSRF_ENABLED': False,
+        'PAGE_CACHE_ENABLED': False,
+        'QUERY_BUDGET_STRICT': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'
+    })
+    with app.app_context():
+        init_db()
+        load_synthetic_data(300, 300, messages=600, reviews=100)
+    return app
+
+@pytest.fixture
+def cold(app):
+    """Forget every stored recommendation and per-process index, as in a freshly started worker."""
+    def reset():
+        with app.app_context():
+            RecommendationCache.query.delete()
+            db.session.commit()
+        main.project_snapshot.engine.version = None
+        main.people_index.loaded_at = None
+        for index in main.autocomplete_indexes.values():
+            index.loaded_at = None
+    return reset
+
+@pytest.fixture
+def log_in(app):
+    """Return a function giving a test client logged in as the user with that email."""
+    def log_in(email, password='password123'):
+        client = app.test_client()
+        response = client.post('/login', data={'email': email, 'password': password})
+        assert response.status_code == 302
+        return client
+    return log_in
+
+@pytest.fixture
+def alice(log_in):
+    return log_in('alice@example.com')
@@ -0,0 +1,37 @@
+"""Project owners can only accept pending collaboration requests, and only while the team has room."""
+from main import CollaborationRequest, Project, User, db
+
+def request_to_join(app):
+    """A pending request from a user outside the team to a synthetic project; returns (request id, owner email)."""
+    with app.app_context():
+        project = Project.query.join(User, User.id == Project.creator_id).filter(
+            User.email.like('%@example.edu')
+        ).order_by(Project.id.desc()).first()
+        sender = User.query.filter(User.id != project.creator_id).filter(
+            ~User.id.in_([member.user_id for member in project.members])
+        ).first()
+        collab_request = CollaborationRequest(project_id=project.id, sender_id=sender.id, status='pending')
+        db.session.add(collab_request)
+        db.session.commit()
+        return collab_request.id, project.creator.email
+
+def status_and_membership(app, request_id):
+    with app.app_context():
+        collab_request = db.session.get(CollaborationRequest, request_id)
+        return collab_request.status, collab_request.project.has_member(collab_request.sender_id)
+
+def test_full_team_cannot_accept(app, log_in):
+    request_id, owner = request_to_join(app)
+    with app.app_context():
+        project = db.session.get(CollaborationRequest, request_id).project
+        project.max_collaborators = project.member_count()
+        db.session.commit()
+    log_in(owner).get(f'/collaboration-request/{request_id}/accept')
+    assert status_and_membership(app, request_id) == ('pending', False)
+
+def test_handled_request_cannot_be_accepted(app, log_in):
+    request_id, owner = request_to_join(app)
+    client = log_in(owner)
+    client.get(f'/collaboration-request/{request_id}/reject')
+    client.get(f'/collaboration-request/{request_id}/accept')
+    assert status_and_membership(app, request_id) == ('rejected', False)
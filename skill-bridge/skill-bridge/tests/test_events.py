@@ -0,0 +1,68 @@
+"""Live events: a write to a user reaches their open /events stream, and closing the stream unsubscribes it."""
+import json
+import threading
+
+from main import Project, User, event_hub
+
+def read_frames(response, frames, until):
+    """Collect server-sent event frames from a streamed response until one starts with until."""
+    buffer = ''
+    for chunk in response.response:
+        buffer += chunk.decode() if isinstance(chunk, bytes) else chunk
+        while '\n\n' in buffer:
+            frame, buffer = buffer.split('\n\n', 1)
+            frames.append(frame)
+            if frame.startswith(until):
+                return
+
+def open_stream(client, until):
+    """Start reading the client's event stream in a thread; returns (response, frames, thread)."""
+    response = client.get('/events', buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    frames = []
+    thread = threading.Thread(target=read_frames, args=(response, frames, until), daemon=True)
+    thread.start()
+    return response, frames, thread
+
+def user_id(app, email):
+    with app.app_context():
+        return User.query.filter_by(email=email).one().id
+
+def event_data(frames, event):
+    for frame in frames:
+        lines = dict(line.split(': ', 1) for line in frame.splitlines() if ': ' in line)
+        if lines.get('event') == event:
+            return json.loads(lines['data'])
+    return None
+
+def test_message_reaches_open_stream(app, alice, log_in):
+    alice_id = user_id(app, 'alice@example.com')
+    response, frames, thread = open_stream(alice, 'event: message')
+    assert alice_id in event_hub.subscribers
+
+    log_in('bob@example.com').post(f'/send_direct_message/{alice_id}', data={'message': 'Hello over SSE'})
+    thread.join(timeout=5)
+    assert not thread.is_alive(), 'no message event arrived'
+    assert frames[0].startswith('retry:')
+    assert event_data(frames, 'message')['content'].startswith('Hello over SSE')
+
+    response.close()
+    assert alice_id not in event_hub.subscribers
+
+def test_collaboration_request_reaches_project_owner(app, log_in):
+    with app.app_context():
+        project = Project.query.filter_by(title='Student Budget Planner').one()
+        project_id, owner = project.id, project.creator
+        owner_id, owner_email = owner.id, owner.email
+    client = log_in(owner_email)
+    response, frames, thread = open_stream(client, 'event: collaboration_request')
+
+    sender = 'ethan@example.com' if owner_email != 'ethan@example.com' else 'diana@example.com'
+    log_in(sender).post(f'/project/{project_id}/collaborate', data={'message': 'Can I help?'})
+    thread.join(timeout=5)
+    assert not thread.is_alive(), 'no collaboration request event arrived'
+    assert event_data(frames, 'collaboration_request') is not None
+
+    response.close()
+    assert owner_id not in event_hub.subscribers
@@ -0,0 +1,32 @@
+"""MinHash LSH index over users' token sets."""
+from lsh import MinHashLSH, jaccard, tokens
+
+def test_tokens_keep_skills_and_interests_apart():
+    assert tokens('Python, sql', 'python') == {'skill:python', 'skill:sql', 'interest:python'}
+    assert tokens(None, '') == frozenset()
+
+def test_load_skips_users_without_tokens():
+    index = MinHashLSH()
+    index.load([(user_id, set()) for user_id in range(5)] + [(100, {'python'}), (101, {'python', 'sql'})],
+               chunk_size=5)
+    assert len(index) == 2
+    assert index.get(0) is None and index.get(100) == {'python'}
+
+def test_query_finds_identical_users_first():
+    index = MinHashLSH()
+    users = {1: {'a', 'b', 'c'}, 2: {'a', 'b', 'c'}, 3: {'a', 'b', 'd'}, 4: {'x', 'y'}}
+    index.load(users.items())
+    found = index.query(users[1], 3, exclude=1)
+    assert found[0] == (2, 1.0)
+    assert all(similarity == jaccard(users[1], users[user_id]) for user_id, similarity in found)
+    assert 4 not in dict(found)
+
+def test_add_and_remove():
+    index = MinHashLSH()
+    index.add(1, {'a', 'b'})
+    index.add(2, {'a', 'b'})
+    assert index.query({'a', 'b'}, 5, exclude=1) == [(2, 1.0)]
+    index.add(2, set())
+    assert len(index) == 1 and index.query({'a', 'b'}, 5, exclude=1) == []
+    index.remove(1)
+    assert len(index) == 0
@@ -0,0 +1,134 @@
+"""Migrating a database to the latest version gives the schema the models declare."""
+import sqlalchemy as sa
+
+import schema
+from main import create_app, db
+
+# The tables as the app created them before there were migrations
+LEGACY_SCHEMA = [
+    """CREATE TABLE user (
+        id INTEGER NOT NULL,
+        username VARCHAR(80) NOT NULL,
+        email VARCHAR(120) NOT NULL,
+        password_hash VARCHAR(128),
+        major VARCHAR(100),
+        skills VARCHAR(500),
+        interests VARCHAR(500),
+        bio TEXT,
+        profile_image VARCHAR(200),
+        experience_points INTEGER,
+        average_rating FLOAT,
+        github VARCHAR(200),
+        linkedin VARCHAR(200),
+        PRIMARY KEY (id),
+        UNIQUE (username),
+        UNIQUE (email)
+    )""",
+    """CREATE TABLE project (
+        id INTEGER NOT NULL,
+        title VARCHAR(100) NOT NULL,
+        description TEXT NOT NULL,
+        required_skills VARCHAR(500),
+        tags VARCHAR(200),
+        creator_id INTEGER NOT NULL,
+        created_at DATETIME,
+        updated_at DATETIME,
+        status VARCHAR(20),
+        collaborators VARCHAR(500),
+        max_collaborators INTEGER,
+        PRIMARY KEY (id),
+        FOREIGN KEY(creator_id) REFERENCES user (id)
+    )""",
+    """CREATE TABLE academic_project (
+        id INTEGER NOT NULL,
+        title VARCHAR(100) NOT NULL,
+        description TEXT NOT NULL,
+        project_type VARCHAR(20) NOT NULL,
+        department VARCHAR(50) NOT NULL,
+        advisor VARCHAR(100),
+        deadline DATE,
+        requirements TEXT,
+        max_collaborators INTEGER,
+        current_collaborators INTEGER,
+        tags VARCHAR(200),
+        status VARCHAR(20),
+        created_at DATETIME,
+        user_id INTEGER NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES user (id)
+    )""",
+    """CREATE TABLE message (
+        id INTEGER NOT NULL,
+        sender_id INTEGER NOT NULL,
+        receiver_id INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        created_at DATETIME,
+        is_read BOOLEAN,
+        PRIMARY KEY (id),
+        FOREIGN KEY(sender_id) REFERENCES user (id),
+        FOREIGN KEY(receiver_id) REFERENCES user (id)
+    )""",
+    """CREATE TABLE review (
+        id INTEGER NOT NULL,
+        reviewer_id INTEGER NOT NULL,
+        reviewee_id INTEGER NOT NULL,
+        project_id INTEGER NOT NULL,
+        rating FLOAT NOT NULL,
+        comment TEXT,
+        feedback_tags VARCHAR(200),
+        created_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(reviewer_id) REFERENCES user (id),
+        FOREIGN KEY(reviewee_id) REFERENCES user (id),
+        FOREIGN KEY(project_id) REFERENCES project (id)
+    )""",
+    """CREATE TABLE collaboration_request (
+        id INTEGER NOT NULL,
+        project_id INTEGER NOT NULL,
+        sender_id INTEGER NOT NULL,
+        message TEXT,
+        status VARCHAR(20),
+        created_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(project_id) REFERENCES project (id),
+        FOREIGN KEY(sender_id) REFERENCES user (id)
+    )""",
+]
+
+def describe(engine):
+    """Every table's columns, indexes and unique constraints, ignoring defaults."""
+    inspector = sa.inspect(engine)
+    return {
+        table: (
+            {column['name']: (str(column['type']), column['nullable']) for column in inspector.get_columns(table)},
+            sorted((index['name'], tuple(index['column_names']), bool(index['unique']))
+                   for index in inspector.get_indexes(table)),
+            sorted(tuple(constraint['column_names']) for constraint in inspector.get_unique_constraints(table))
+        )
+        for table in inspector.get_table_names() if table != schema.VERSION_TABLE
+    }
+
+def legacy_app(path):
+    """An app on a database with the tables as they were before the first migration."""
+    app = create_app({'TESTING': True, 'SECRET_KEY': 'test', 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+    with app.app_context(), db.engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(sa.text(statement))
+    return app
+
+def test_upgrade_matches_the_models(tmp_path):
+    expected_app = create_app({'TESTING': True, 'SECRET_KEY': 'test',
+                               'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "expected.db"}'})
+    with expected_app.app_context():
+        db.create_all()
+        expected = describe(db.engine)
+    with legacy_app(tmp_path / 'migrated.db').app_context():
+        schema.upgrade(db.engine)
+        assert describe(db.engine) == expected
+
+def test_versions_are_frozen(tmp_path):
+    with legacy_app(tmp_path / 'migrated.db').app_context():
+        schema.upgrade(db.engine, 1)
+        columns = {column['name'] for column in sa.inspect(db.engine).get_columns('skill')}
+        # display_name belongs to 0010
+        assert columns == {'id', 'name'}
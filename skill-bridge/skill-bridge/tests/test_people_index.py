@@ -0,0 +1,32 @@
+"""The people index is built in the background, and only once there are PEOPLE_INDEX_MIN_USERS users."""
+import time
+
+import pytest
+
+import main
+from main import User, db, get_people_index, rank_users
+
+def built_index():
+    deadline = time.time() + 10
+    while (index := get_people_index()) is None or 'people' in main.rebuilding:
+        assert time.time() < deadline
+        time.sleep(0.05)
+    return index
+
+@pytest.fixture
+def people_app(app, cold):
+    cold()
+    yield app
+    app.config['PEOPLE_INDEX_MIN_USERS'] = main.DEFAULT_CONFIG['PEOPLE_INDEX_MIN_USERS']
+    cold()
+
+def test_small_catalogs_leave_the_index_empty(people_app):
+    with people_app.app_context():
+        assert len(built_index()) == 0
+        alice = User.query.filter_by(email='alice@example.com').one()
+        assert rank_users(alice.id, 3)
+
+def test_index_is_built_above_the_threshold(people_app):
+    people_app.config['PEOPLE_INDEX_MIN_USERS'] = 1
+    with people_app.app_context():
+        assert len(built_index()) == db.session.query(db.func.count(User.id)).scalar()
@@ -0,0 +1,19 @@
+"""Project changes build a new snapshot instead of reloading the one other threads may be ranking with."""
+import main
+from main import Project, db, get_project_snapshot, rank_projects
+
+def test_changes_replace_the_snapshot(app, cold):
+    cold()
+    with app.app_context():
+        old = get_project_snapshot()
+        project_ids = old.engine.project_ids.copy()
+        project = db.session.get(Project, int(project_ids[0]))
+        project.max_collaborators += 1
+        db.session.commit()
+
+        new = get_project_snapshot()
+        assert new is not old and main.project_snapshot is new
+        # The old snapshot is untouched and still ranks consistently
+        assert (old.engine.project_ids == project_ids).all()
+        assert len(old.catalog.project_ids) == len(old.engine.project_ids)
+        assert rank_projects('python', 3, snapshot=old)
@@ -0,0 +1,33 @@
+"""The hot routes stay within their query budgets, cold caches included (QUERY_BUDGET_STRICT raises otherwise)."""
+import pytest
+from flask import g
+
+from main import QueryBudgetExceeded, query_budget
+
+LOGGED_IN_ROUTES = [
+    '/', '/?search=data', '/?sort=match', '/?tag=web', '/recommendations', '/recommendations?format=json',
+    '/api/v1/recommendations', '/profile/alice_dev', '/project/1', '/messages', '/user_messages/2',
+    '/search?q=python', '/collaboration-requests', '/api/v1/projects', '/api/v1/messages',
+    '/api/v1/search?q=python', '/api/v1/autocomplete?q=py'
+]
+ANONYMOUS_ROUTES = ['/', '/project/1', '/profile/alice_dev', '/search?q=python', '/api/v1/projects']
+
+@pytest.mark.parametrize('path', LOGGED_IN_ROUTES)
+def test_logged_in_routes_within_budget(alice, cold, path):
+    cold()
+    for _ in ('cold', 'warm'):
+        response = alice.get(path)
+        assert response.status_code == 200, path
+
+@pytest.mark.parametrize('path', ANONYMOUS_ROUTES)
+def test_anonymous_routes_within_budget(app, cold, path):
+    cold()
+    response = app.test_client().get(path)
+    assert response.status_code == 200, path
+
+def test_strict_mode_raises_over_budget(app):
+    view = query_budget(1)(lambda: 'ok')
+    with app.test_request_context('/'):
+        g.query_count = 2
+        with pytest.raises(QueryBudgetExceeded):
+            view()
@@ -0,0 +1,38 @@
+"""Read-only views read from the replica until they write, then from the primary."""
+import shutil
+
+import pytest
+
+from main import RecommendationCache, User, create_app, db, init_db
+
+@pytest.fixture
+def replica_app(tmp_path):
+    """An app whose 'read' bind is a snapshot of the primary, so it lags behind every later write."""
+    primary, replica = tmp_path / 'primary.db', tmp_path / 'replica.db'
+    config = {
+        'TESTING': True,
+        'SECRET_KEY': 'test',
+        'WTF_CSRF_ENABLED': False,
+        'PAGE_CACHE_ENABLED': False,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{primary}'
+    }
+    app = create_app(config)
+    with app.app_context():
+        init_db()
+        RecommendationCache.query.delete()
+        db.session.commit()
+        db.engine.dispose()
+    shutil.copy(primary, replica)
+    return create_app(dict(config, SQLALCHEMY_BINDS={'read': f'sqlite:///{replica}'}))
+
+def test_read_only_view_reads_its_own_writes(replica_app):
+    client = replica_app.test_client()
+    client.post('/login', data={'email': 'alice@example.com', 'password': 'password123'})
+    # The home page builds alice's missing recommendations row, then reads it back
+    response = client.get('/')
+    assert response.status_code == 200
+    with replica_app.app_context():
+        alice = User.query.filter_by(email='alice@example.com').one()
+        assert db.session.get(RecommendationCache, alice.id) is not None
+        with db.engines['read'].connect() as connection:
+            assert connection.execute(db.select(RecommendationCache)).first() is None
@@ -0,0 +1,21 @@
+"""Stored recommendations from an earlier hour are served as they are and ranked again in the background."""
+import time
+from datetime import datetime, timedelta, timezone
+
+import main
+from main import RecommendationCache, User, db, epoch_seconds, ranking_now
+
+def test_last_hours_row_is_refreshed_in_the_background(app, alice):
+    with app.app_context():
+        user_id = User.query.filter_by(email='alice@example.com').one().id
+    assert alice.get('/').status_code == 200
+    with app.app_context():
+        db.session.get(RecommendationCache, user_id).updated_at = datetime.now(timezone.utc) - timedelta(hours=2)
+        db.session.commit()
+
+    assert alice.get('/recommendations').status_code == 200
+    deadline = time.time() + 10
+    while f'recommendations:{user_id}' in main.rebuilding and time.time() < deadline:
+        time.sleep(0.05)
+    with app.app_context():
+        assert epoch_seconds(db.session.get(RecommendationCache, user_id).updated_at) >= ranking_now()